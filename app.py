@@ -1,98 +1,312 @@
-from flask import Flask, request, jsonify
-import pymongo
-from ml_model.predictor import EmploymentPredictor
+from startupProfile import timed, report
+with timed('import flask'):
+    from flask import Flask, request, jsonify, Response, stream_with_context
+    from flask_cors import CORS
+with timed('import pymongo'):
+    import pymongo
+    from bson import ObjectId
+    from bson.errors import InvalidId
 from config import Config
-from flask_cors import CORS
+from statsWriter import StatsWriter
+from predictionCounters import Counters
+from predictionRollups import Rollups
+from ml_model.features import EDUCATION_LEVELS, education_flags, education_matrix
+from ml_model.modelRegistry import ActiveModel, get_registry, is_version, KERAS_MODEL, SCALER, NUMPY_MODEL, MMAP_MODEL, PREDICTION_GRID, COMPACT_PREDICTION_GRID, OPERATING_POINTS, COMPACT_MODEL, COMPACT_MMAP_MODEL
+from ml_model.predictionCache import PredictionCache, load_grid
+from ml_model.operatingPoints import load_operating_points, resolve_threshold
+import atexit
 import datetime
+import json
+import os
+import threading
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}}) 
 
-client = pymongo.MongoClient(Config.MONGO_URI)
+# connect=False defers the connection to the first query instead of import time
+client = pymongo.MongoClient(Config.MONGO_URI, connect=False)
 db = client[Config.DATABASE_NAME] 
 
-predictor = EmploymentPredictor()
-predictor.load_model('ml_model/trained/model.h5', 'ml_model/trained/scaler.npz')
+def ensure_indexes():
+    try:
+        # Newest-first keyset pagination over /api/predictions
+        db.stats.create_index([('timestamp', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)])
+        rollups.ensure_indexes()
+    except Exception as e:
+        print("Failed to create indexes:", e)
+
+counters = Counters(db[Config.COUNTERS_COLLECTION])
+rollups = Rollups(db[Config.ROLLUPS_COLLECTION])
+
+# Run in the background so an unreachable Mongo does not hold up startup
+threading.Thread(target=ensure_indexes, daemon=True).start()
 
+counters.start_reconciler(db.stats, db[Config.JOBS_COLLECTION], Config.COUNTERS_RECONCILE_INTERVAL)
+rollups.start_backfill(db.stats)
 
-def extract_education(text):
-    """ Map educational levels to structured format. """
-    levels = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
-    values = [0] * len(levels)
+# Prediction stats are written behind the request instead of on its critical path
+stats_writer = StatsWriter(db.stats,
+                           flush_size=Config.STATS_FLUSH_SIZE,
+                           flush_interval=Config.STATS_FLUSH_INTERVAL,
+                           max_pending=Config.STATS_MAX_PENDING,
+                           policy=Config.STATS_OVERFLOW_POLICY,
+                           block_timeout=Config.STATS_BLOCK_TIMEOUT,
+                           listeners=[counters.record_predictions, rollups.record_predictions])
+atexit.register(stats_writer.close)
 
-    if 'Bac' in text and 'Bac +' not in text:
-        values[0] = 1 
+def load_predictor(path):
+    """ Load one model version directory, or model.h5 from the legacy flat layout. """
+    exported = is_version(path)
+    if exported and Config.SERVE_COMPACT and (os.path.isdir(os.path.join(path, COMPACT_MMAP_MODEL)) or os.path.exists(os.path.join(path, COMPACT_MODEL))):
+        # int8 weights for small replicas; same predict interface as predictorNumpy
+        with timed('import ml_model.predictorCompact'):
+            from ml_model.predictorCompact import EmploymentPredictor
+        model_path = os.path.join(path, COMPACT_MMAP_MODEL)
+        if not os.path.isdir(model_path):
+            model_path = os.path.join(path, COMPACT_MODEL)
+        with timed('load ' + model_path):
+            predictor = EmploymentPredictor()
+            predictor.load_model(model_path, mmap_mode='r')
+        predictor.operating_points = load_operating_points(os.path.join(path, OPERATING_POINTS))
+        # The version's main grid holds float32 predictions; use the one computed with this engine
+        predictor.prediction_grid = COMPACT_PREDICTION_GRID
+        return predictor
+    if exported and (os.path.isdir(os.path.join(path, MMAP_MODEL)) or os.path.exists(os.path.join(path, NUMPY_MODEL))):
+        # Exported artifact available: serve without importing TensorFlow.
+        # The folded directory is memory-mapped so worker processes share the weights.
+        with timed('import ml_model.predictorNumpy'):
+            from ml_model.predictorNumpy import EmploymentPredictor
+        model_path = os.path.join(path, MMAP_MODEL)
+        if not os.path.isdir(model_path):
+            model_path = os.path.join(path, NUMPY_MODEL)
+        with timed('load ' + model_path):
+            predictor = EmploymentPredictor()
+            predictor.load_model(model_path, mmap_mode='r')
+        predictor.operating_points = load_operating_points(os.path.join(path, OPERATING_POINTS))
+        return predictor
+    with timed('import ml_model.predictor'):
+        from ml_model.predictor import EmploymentPredictor
+    with timed('load ' + os.path.join(path, KERAS_MODEL)):
+        predictor = EmploymentPredictor()
+        predictor.load_model(os.path.join(path, KERAS_MODEL), os.path.join(path, SCALER))
+    predictor.operating_points = load_operating_points(os.path.join(path, OPERATING_POINTS))
+    return predictor
 
-    if 'Bac +2' in text:
-        values[0:2] = [1, 1] 
+prediction_cache = None
+if Config.PREDICTION_CACHE_ENABLED:
+    prediction_cache = PredictionCache(Config.PREDICTION_CACHE_SIZE, Config.PREDICTION_CACHE_TTL)
 
-    if 'Bac +3' in text:
-        values[0:3] = [1, 1, 1]
+def on_model_swap(loaded):
+    # Cached predictions belong to the previous model; start over with the new version's grid
+    if prediction_cache:
+        grid_name = getattr(loaded.predictor, 'prediction_grid', PREDICTION_GRID)
+        prediction_cache.invalidate(loaded.version, load_grid(os.path.join(loaded.path, grid_name)))
 
-    if 'Bac +4' in text:
-        values[0:4] = [1, 1, 1, 1] 
+# Each request resolves active_model.predictor once; new registry versions are swapped in behind them
+active_model = ActiveModel(get_registry(), load_predictor, listeners=[on_model_swap])
+active_model.start_watcher(Config.MODEL_RELOAD_INTERVAL)
 
-    if 'Bac +5' in text or 'Bac +5 et plus' in text:
-        values[0:5] = [1, 1, 1, 1, 1] 
+batcher = None
+if Config.MICRO_BATCH_ENABLED:
+    from ml_model.microBatcher import MicroBatcher
+    batcher = MicroBatcher(lambda records: list(active_model.predictor.predict_proba_batch(records, chunk_size=len(records))),
+                           max_batch_size=Config.MICRO_BATCH_MAX_SIZE,
+                           max_wait_ms=Config.MICRO_BATCH_MAX_WAIT_MS)
 
-    if 'Doctorat' in text or 'Doctorate' in text:
-        values[:] = [1, 1, 1, 1, 1, 1]  
 
-    return dict(zip(levels, values))
+def prepare_input(input_data):
+    """ Replace the free-text study level with the structured education flags. """
+    education_data = education_flags(input_data['study_level'])
+    input_data.update(education_data)
+    del input_data['study_level']
+    return input_data
 
 
+def read_batch_records():
+    """ Yield input records from a JSON array body or an NDJSON stream. """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonlines'):
+        for line in request.stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        yield from request.get_json()
+
+
+def cached_probability(input_data):
+    key = prediction_cache.key(input_data) if prediction_cache else None
+    probability = prediction_cache.get(key) if prediction_cache else None
+    if probability is None:
+        # Read the version before predicting: if a swap lands in between, the put is discarded
+        version = active_model.version
+        probability = batcher.predict(input_data) if batcher else active_model.predictor.predict_proba(input_data)
+        if prediction_cache:
+            prediction_cache.put(key, probability, version)
+    return probability
+
 @app.route('/')
 def index():
     return 'Employability Prediction API is running'
 
 @app.route('/predict', methods=['POST'])
 def predict():
+    try:
+        threshold = resolve_threshold(request.args, active_model.predictor.operating_points)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         input_data = request.get_json()
         print("Original input data:", input_data)
 
-        education_data = extract_education(input_data['study_level'])
-        input_data.update(education_data) 
-
-        del input_data['study_level']
+        prepare_input(input_data)
 
         print("Updated input data for prediction:", input_data)
-        prediction = predictor.predict(input_data)
+        probability = cached_probability(input_data)
+        prediction = int(probability > threshold)
         
         stats_data = {
             **input_data,
-            'prediction': int(prediction),
+            'prediction': prediction,
+            'probability': probability,
+            'threshold': threshold,
             'timestamp': datetime.datetime.now()
         }
-        db.stats.insert_one(stats_data)
+        stats_writer.write(stats_data)
         
-        return jsonify({'prediction': int(prediction)})
+        return jsonify({'prediction': prediction, 'probability': probability, 'threshold': threshold})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        threshold = resolve_threshold(request.args, active_model.predictor.operating_points)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        try:
+            chunk = []
+            for input_data in read_batch_records():
+                chunk.append(input_data)
+                if len(chunk) == Config.BATCH_CHUNK_SIZE:
+                    yield from predict_chunk(chunk)
+                    chunk = []
+            if chunk:
+                yield from predict_chunk(chunk)
+        except Exception as e:
+            # Headers are already sent once streaming starts, so report inline
+            yield json.dumps({'error': str(e)}) + '\n'
+
+    def predict_chunk(chunk):
+        # One vectorized education transform for the whole chunk
+        education = education_matrix([input_data.pop('study_level') for input_data in chunk])
+        for input_data, flags in zip(chunk, education.tolist()):
+            input_data.update(zip(EDUCATION_LEVELS, flags))
+        probabilities = predict_records(chunk)
+        timestamp = datetime.datetime.now()
+        results = [{'prediction': int(probability > threshold), 'probability': probability, 'threshold': threshold}
+                   for probability in probabilities]
+        for input_data, result in zip(chunk, results):
+            stats_writer.write({**input_data, **result, 'timestamp': timestamp})
+        for result in results:
+            yield json.dumps(result) + '\n'
+
+    def predict_records(records):
+        if not prediction_cache:
+            return list(active_model.predictor.predict_proba_batch(records, chunk_size=len(records)))
+        keys = [prediction_cache.key(input_data) for input_data in records]
+        probabilities = [prediction_cache.get(key) for key in keys]
+        misses = [n for n, probability in enumerate(probabilities) if probability is None]
+        if misses:
+            # Only the cache misses go through the model, still as one batch
+            version = active_model.version
+            computed = active_model.predictor.predict_proba_batch([records[n] for n in misses], chunk_size=len(misses))
+            for n, probability in zip(misses, computed):
+                probabilities[n] = probability
+                prediction_cache.put(keys[n], probability, version)
+        return probabilities
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
     
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    metrics = {'stats_writer': stats_writer.stats()}
+    if prediction_cache:
+        metrics['prediction_cache'] = prediction_cache.stats()
+    if batcher:
+        metrics['batcher'] = batcher.stats()
+    return jsonify(metrics)
+
+@app.route('/model', methods=['GET'])
+def get_model():
+    return jsonify({**active_model.info(), 'operating_points': active_model.predictor.operating_points})
+
 @app.route('/api/counts', methods=['GET'])
 def get_counts():
     try:
-        jobs_count = db.jobs_collection.count_documents({})
-        stats_count = db.stats.count_documents({})
-        employable_count = db.stats.count_documents({'prediction': 1})
-        non_employable_count = db.stats.count_documents({'prediction': 0})
-        
-        counts = {
-            "jobs_count": jobs_count,
-            "stats_count": stats_count,
-            "employable_count": employable_count,
-            "non_employable_count": non_employable_count
-        }
-        return jsonify(counts)
+        return jsonify(counters.get())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def encode_cursor(doc):
+    return f"{doc['timestamp'].isoformat()}|{doc['_id']}"
+
+def decode_cursor(cursor):
+    timestamp, _id = cursor.split('|')
+    timestamp = datetime.datetime.fromisoformat(timestamp)
+    return {'$or': [
+        {'timestamp': {'$lt': timestamp}},
+        {'timestamp': timestamp, '_id': {'$lt': ObjectId(_id)}},
+    ]}
+
 @app.route('/api/predictions', methods=['GET'])
 def get_predictions():
+    """ Newest-first predictions, one page at a time.
+
+    ?limit=N&after=<cursor> returns the page after `cursor`; the cursor for the
+    next page is sent in the X-Next-After header. ?format=ndjson streams the
+    full export straight from the Mongo cursor instead.
+    """
+    sort = [('timestamp', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)]
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            cursor = db.stats.find({}, {'_id': 0}).sort(sort).batch_size(Config.PREDICTIONS_EXPORT_BATCH_SIZE)
+            for doc in cursor:
+                yield json.dumps(doc, default=str) + '\n'
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
     try:
-        predictions = list(db.stats.find({}, {'_id': 0}).sort('timestamp', -1))
-        return jsonify(predictions)
+        limit = int(request.args.get('limit', Config.PREDICTIONS_PAGE_SIZE))
+        # Mongo reads limit(0) as "no limit", so it must not get through
+        if not 1 <= limit <= Config.PREDICTIONS_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {Config.PREDICTIONS_MAX_PAGE_SIZE}")
+        after = request.args.get('after')
+        query = decode_cursor(after) if after else {}
+    except (ValueError, InvalidId) as e:
+        return jsonify({'error': f'Invalid pagination parameters: {e}'}), 400
+
+    try:
+        predictions = list(db.stats.find(query).sort(sort).limit(limit))
+        response = jsonify([{k: v for k, v in doc.items() if k != '_id'} for doc in predictions])
+        if len(predictions) == limit:
+            response.headers['X-Next-After'] = encode_cursor(predictions[-1])
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predictions/histogram', methods=['GET'])
+def get_predictions_histogram():
+    """ Prediction counts per bucket: ?granularity=hour|day|week&start=<iso>&end=<iso> """
+    try:
+        granularity = request.args.get('granularity', 'day')
+        start = request.args.get('start')
+        end = request.args.get('end')
+        start = datetime.datetime.fromisoformat(start) if start else None
+        end = datetime.datetime.fromisoformat(end) if end else None
+        return jsonify(rollups.histogram(granularity, start, end))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -102,8 +316,11 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    response.headers.add('Access-Control-Expose-Headers', 'X-Next-After')
     return response
 
 
+report()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0')
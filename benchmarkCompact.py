@@ -0,0 +1,128 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from config import Config
+from ml_model.modelRegistry import get_registry, is_version, KERAS_MODEL, SCALER, NUMPY_MODEL
+
+# Size, memory and latency of the compact (int8 / pruned) model against the
+# original model.h5 and the float32 NumPy export of the current model version.
+# Every variant is measured in a fresh interpreter so RSS only counts that
+# variant's imports and weights. Accuracy uses the split_data test split when
+# the training data is reachable (MongoDB or FEATURE_SNAPSHOT).
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 2000))
+BATCH = 1024
+SAMPLE = {"experience_required": 3, "Bac": 1, "Bac +2": 1, "Bac +3": 1, "Bac +4": 0, "Bac +5": 0, "Doctorate": 0}
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, KB on Linux
+
+def disk_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+def measure(kind, path, test_path):
+    """ Runs in the child process: load one variant, then time it. """
+    baseline = rss_mb()
+    start = time.perf_counter()
+    if kind == 'keras':
+        from ml_model.predictor import EmploymentPredictor
+        predictor = EmploymentPredictor()
+        predictor.load_model(path, os.path.join(os.path.dirname(path), SCALER))
+        forward = lambda X: predictor.model.predict(X, batch_size=len(X), verbose=0)
+    else:
+        if kind == 'numpy':
+            from ml_model.predictorNumpy import EmploymentPredictor
+        else:
+            from ml_model.predictorCompact import EmploymentPredictor
+        predictor = EmploymentPredictor()
+        predictor.load_model(path)
+        forward = predictor.forward
+    load_seconds = time.perf_counter() - start
+
+    timings = []
+    predictor.predict_proba(SAMPLE)
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        predictor.predict_proba(SAMPLE)
+        timings.append((time.perf_counter() - start) * 1000)
+    records = [SAMPLE] * BATCH
+    list(predictor.predict_proba_batch(records, chunk_size=BATCH))
+    start = time.perf_counter()
+    for _ in range(10):
+        list(predictor.predict_proba_batch(records, chunk_size=BATCH))
+    batch_ms = (time.perf_counter() - start) * 100
+
+    accuracy = None
+    if test_path:
+        test = np.load(test_path)
+        accuracy = float(np.mean((np.asarray(forward(test['X']))[:, 0] > 0.5) == test['y']))
+    return {
+        'rss_mb': rss_mb(),
+        'rss_added_mb': rss_mb() - baseline,
+        'load_seconds': load_seconds,
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'batch_ms': batch_ms,
+        'accuracy': accuracy,
+    }
+
+def test_split(path):
+    """ Save the split_data test split (already scaled) for the children, or return None. """
+    try:
+        from ml_model.predictor import EmploymentPredictor
+        predictor = EmploymentPredictor()
+        predictor.extract_data()
+        predictor.split_data()
+    except Exception as e:
+        print("Test split unavailable, skipping accuracy:", e)
+        return None
+    np.savez(path, X=np.asarray(predictor.X_test, dtype=np.float32), y=np.asarray(predictor.y_test))
+    return path
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        kind, path, test_path = sys.argv[2:5]
+        print(json.dumps(measure(kind, path, test_path or None)))
+        sys.exit()
+
+    from ml_model import predictorNumpy, predictorCompact
+    version, path = get_registry().resolve()
+    if path is None or not is_version(path) or not os.path.exists(os.path.join(path, NUMPY_MODEL)):
+        sys.exit("No exported model; train one first (python train.py --force).")
+    print(f"Model version {version} ({path})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = predictorNumpy.EmploymentPredictor()
+        engine.load_model(os.path.join(path, NUMPY_MODEL))
+        variants = []
+        if os.path.exists(os.path.join(path, KERAS_MODEL)) and importlib.util.find_spec('tensorflow'):
+            variants.append(('model.h5 (Keras)', 'keras', os.path.join(path, KERAS_MODEL)))
+        variants.append(('float32 NumPy', 'numpy', os.path.join(path, NUMPY_MODEL)))
+        for name, sparsity in [('int8', 0.0), (f'int8 + {Config.COMPACT_SPARSITY:.0%} pruned', Config.COMPACT_SPARSITY)]:
+            compact_path = os.path.join(tmp, f'compact_{sparsity}.npz')
+            predictorCompact.EmploymentPredictor.from_engine(engine, sparsity=sparsity).save_model(compact_path)
+            variants.append((name, 'compact', compact_path))
+
+        test_path = test_split(os.path.join(tmp, 'test.npz'))
+        print(f"{'variant':>22} {'disk KB':>9} {'RSS MB':>8} {'+MB':>7} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {f'{BATCH}-row ms':>11} {'accuracy':>9}")
+        for name, kind, variant_path in variants:
+            output = subprocess.run([sys.executable, __file__, '--worker', kind, variant_path, test_path or ''],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            accuracy = f"{result['accuracy']:.4f}" if result['accuracy'] is not None else '-'
+            print(f"{name:>22} {disk_size(variant_path) / 1024:9.1f} {result['rss_mb']:8.1f} {result['rss_added_mb']:7.1f} {result['load_seconds']:7.3f} "
+                  f"{result['p50_ms']:8.3f} {result['p99_ms']:8.3f} {result['batch_ms']:11.2f} {accuracy:>9}")
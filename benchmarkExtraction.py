@@ -0,0 +1,59 @@
+import glob
+import json
+import os
+import time
+from scrapy.http import HtmlResponse
+from spiders.job_spider import JobSpider
+
+# Offline extraction benchmark over debugData/fixtures: listings/sec and field-level
+# correctness for each JobSpider extraction variant. The fixture pages are a small
+# hand-written corpus that follows rekrute's listing markup, not saved live pages.
+FIXTURES = 'debugData/fixtures'
+BASE_URL = 'https://www.rekrute.com/offres.html?p='
+REPEAT = int(os.environ.get('BENCH_REPEAT', 200))
+
+def load_corpus():
+    responses = []
+    for n, path in enumerate(sorted(glob.glob(os.path.join(FIXTURES, 'listings_*.html'))), 1):
+        with open(path, 'rb') as f:
+            responses.append(HtmlResponse(url=f'{BASE_URL}{n}', body=f.read(), encoding='utf-8'))
+    with open(os.path.join(FIXTURES, 'expected_items.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    return responses, expected
+
+def extract_all(spider, extract, responses):
+    """ The extraction half of JobSpider.parse (the dedup query needs Mongo). """
+    items = []
+    for response in responses:
+        for job in response.xpath('//ul[@id="post-data"]/li'):
+            job_detail_url = response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get())
+            items.append(dict(extract(job, response, job_detail_url)))
+    return items
+
+def field_accuracy(items, expected):
+    correct, total = {}, {}
+    for item in items:
+        truth = expected.get(item['job_detail_url'], {})
+        for field, value in truth.items():
+            total[field] = total.get(field, 0) + 1
+            correct[field] = correct.get(field, 0) + (item.get(field) == value)
+    return {field: correct[field] / total[field] for field in total}
+
+if __name__ == '__main__':
+    responses, expected = load_corpus()
+    spider = JobSpider(url=BASE_URL + '1')
+    variants = [('per-field xpath', spider.extract_job_item), ('single pass', spider.extract_job_item_single_pass)]
+
+    for name, extract in variants:
+        items = extract_all(spider, extract, responses)
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            extract_all(spider, extract, responses)
+        elapsed = time.perf_counter() - start
+
+        accuracy = field_accuracy(items, expected)
+        wrong = {field: f'{score:.0%}' for field, score in accuracy.items() if score < 1}
+        print(f"{name:>16}: {REPEAT * len(items) / elapsed:9.0f} listings/sec, "
+              f"{len(items)}/{len(expected)} listings, "
+              f"{sum(accuracy.values()) / len(accuracy):.1%} fields correct"
+              + (f", mismatches: {wrong}" if wrong else ""))
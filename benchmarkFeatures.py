@@ -0,0 +1,57 @@
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from ml_model.features import education_matrix, experience_lists, first_element
+
+# ml_model.features transforms against the per-row Python they replaced,
+# on a synthetic column of BENCH_ROWS jobs. Both sides must produce identical output.
+ROWS = int(os.environ.get('BENCH_ROWS', 1_000_000))
+STUDY_LEVELS = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5 et plus', 'Doctorat', 'Autodidacte']
+EXPERIENCES = ['De 1 à 3 ans', 'De 3 à 5 ans', 'De 5 à 10 ans', 'Plus de 10 ans', 'Débutant < 1 an', 'Sans expérience']
+
+def education_loop(texts):
+    rows = []
+    for text in texts:
+        values = [0] * 6
+        if 'Bac' in text and 'Bac +' not in text:
+            values[0] = 1
+        for level in range(2, 6):
+            if f'Bac +{level}' in text:
+                values[0:level] = [1] * level
+        if 'Doctorat' in text:
+            values[:] = [1] * 6
+        rows.append(values)
+    return np.array(rows, dtype=np.int8)
+
+def experience_loop(texts):
+    return [[int(num) for num in re.findall(r'\d+', text)] or [0] for text in texts]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    study = np.array(STUDY_LEVELS)[rng.integers(len(STUDY_LEVELS), size=ROWS)]
+    experience = np.array(EXPERIENCES)[rng.integers(len(EXPERIENCES), size=ROWS)]
+    sectors = pd.Series([[s] for s in experience[:ROWS // 10]])
+
+    cases = []
+    loop, loop_time = timed(education_loop, study)
+    fast, fast_time = timed(education_matrix, study)
+    cases.append(('education', loop_time, fast_time, np.array_equal(loop, fast), ROWS))
+
+    loop, loop_time = timed(experience_loop, experience)
+    fast, fast_time = timed(experience_lists, experience)
+    cases.append(('experience', loop_time, fast_time, loop == fast, ROWS))
+
+    loop, loop_time = timed(lambda s: s.apply(lambda x: x[0] if isinstance(x, list) and x else None), sectors)
+    fast, fast_time = timed(first_element, sectors)
+    cases.append(('first_element', loop_time, fast_time, loop.tolist() == fast.tolist(), len(sectors)))
+
+    for name, loop_time, fast_time, same, rows in cases:
+        print(f"{name:>16}: {rows / loop_time:11.0f} rows/sec per-row, {rows / fast_time:11.0f} rows/sec features.py, "
+              f"{loop_time / fast_time:5.1f}x, {'identical' if same else 'MISMATCH'}")
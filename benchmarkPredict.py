@@ -0,0 +1,35 @@
+import time
+import numpy as np
+import os
+from ml_model.predictor import EmploymentPredictor
+from ml_model.modelRegistry import get_registry, KERAS_MODEL, SCALER
+
+# Micro-benchmark: fast single-record predict vs the original pandas path
+ITERATIONS = 500
+
+samples = [
+    {"experience_required": exp, "Bac": 1, "Bac +2": b2, "Bac +3": b3, "Bac +4": 0, "Bac +5": 0, "Doctorate": 0}
+    for exp in range(0, 10) for b2, b3 in [(0, 0), (1, 0), (1, 1)]
+]
+
+def measure(fn):
+    timings = []
+    for i in range(ITERATIONS):
+        sample = samples[i % len(samples)]
+        start = time.perf_counter()
+        fn(sample)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+if __name__ == '__main__':
+    predictor = EmploymentPredictor()
+    _, path = get_registry().resolve()
+    predictor.load_model(os.path.join(path, KERAS_MODEL), os.path.join(path, SCALER))
+
+    mismatches = [s for s in samples if predictor.predict(s) != predictor.predict_pandas(s)]
+    print(f"Parity: {len(samples) - len(mismatches)}/{len(samples)} samples match")
+
+    for name, fn in [('pandas', predictor.predict_pandas), ('fast', predictor.predict)]:
+        fn(samples[0])  # warm up
+        p50, p99 = measure(fn)
+        print(f"{name:>6}: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
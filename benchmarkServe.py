@@ -0,0 +1,35 @@
+import sys
+import time
+from multiprocessing import Pool
+import os
+import requests
+
+# Load generator for /predict: runs an increasing number of client processes
+# against a running server (python serve.py) and reports requests/sec.
+URL = os.environ.get('PREDICT_URL', 'http://localhost:5000/predict')
+DURATION = float(os.environ.get('BENCH_SECONDS', 10))
+
+payload = {"experience_required": 2, "study_level": "Bac +3", "skills": ""}
+
+def client(_):
+    session = requests.Session()
+    done = errors = 0
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        response = session.post(URL, json=payload)
+        if response.status_code == 200:
+            done += 1
+        else:
+            errors += 1
+    return done, errors
+
+if __name__ == '__main__':
+    max_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 2 * (os.cpu_count() or 1)
+    concurrency = 1
+    while concurrency <= max_clients:
+        with Pool(concurrency) as pool:
+            results = pool.map(client, range(concurrency))
+        done = sum(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+        print(f"{concurrency:>3} clients: {done / DURATION:8.1f} req/s ({errors} errors)")
+        concurrency *= 2
@@ -1,3 +1,5 @@
+import os
+
 class Config:
     MONGO_URI = 'mongodb://localhost:27017/'
     DATABASE_NAME = 'EmployabilityAPP'
@@ -6,3 +8,60 @@ class Config:
     functions_collection = 'functions'
     sectors_collection = 'sectors'
     base_Path = '/home/abdennacer/Documents/GitHub/EmployabilityAPP/'
+    BATCH_CHUNK_SIZE = 1024
+    PROFILE_STARTUP = os.environ.get('PROFILE_STARTUP') == '1'
+    SERVE_BIND = os.environ.get('SERVE_BIND', '0.0.0.0:5000')
+    SERVE_WORKERS = int(os.environ.get('SERVE_WORKERS', os.cpu_count() or 1))
+    SERVE_THREADS = int(os.environ.get('SERVE_THREADS', 8))
+    MICRO_BATCH_ENABLED = os.environ.get('MICRO_BATCH_ENABLED', '1') == '1'
+    MICRO_BATCH_MAX_SIZE = 32
+    MICRO_BATCH_MAX_WAIT_MS = 5
+    STATS_FLUSH_SIZE = 500
+    STATS_FLUSH_INTERVAL = 1.0
+    STATS_MAX_PENDING = 10000
+    STATS_OVERFLOW_POLICY = 'drop'
+    STATS_BLOCK_TIMEOUT = 0.5
+    COUNTERS_COLLECTION = 'counters'
+    COUNTERS_RECONCILE_INTERVAL = 3600
+    PREDICTIONS_PAGE_SIZE = 100
+    PREDICTIONS_MAX_PAGE_SIZE = 1000
+    PREDICTIONS_EXPORT_BATCH_SIZE = 1000
+    ROLLUPS_COLLECTION = 'stats_rollups'
+    FRONTIER_COLLECTION = 'crawl_frontier'
+    INCREMENTAL_CRAWL = os.environ.get('INCREMENTAL_CRAWL', '1') == '1'
+    CRAWL_STATE_COLLECTION = 'crawl_state'
+    RETRAIN_MIN_NEW_ROWS = int(os.environ.get('RETRAIN_MIN_NEW_ROWS', 200))
+    EXTRACT_BATCH_SIZE = 5000
+    FEATURE_STORE_DIR = 'ml_model/features'
+    # Pin a feature snapshot to train without touching MongoDB at all
+    FEATURE_SNAPSHOT = os.environ.get('FEATURE_SNAPSHOT')
+    DEBUG_DUMPS = os.environ.get('DEBUG_DUMPS') == '1'
+    SEARCH_WORKERS = int(os.environ.get('SEARCH_WORKERS', os.cpu_count() or 1))
+    SEARCH_FOLDS = 5
+    MODEL_SEARCH_DIR = 'ml_model/trained/search'
+    # 'tfdata' (cached tf.data pipeline, batch-size schedule) or 'legacy' (fit on the pandas frames)
+    TRAIN_PIPELINE = os.environ.get('TRAIN_PIPELINE', 'tfdata')
+    TRAIN_THREADS = int(os.environ.get('TRAIN_THREADS', 0))
+    TRAIN_BATCH_SCHEDULE = [64, 256, 1024]
+    TRAIN_PHASE_EPOCHS = 200
+    TRAIN_PATIENCE = 10
+    # Each training run publishes a new version directory here and repoints its CURRENT file
+    MODEL_REGISTRY_DIR = 'ml_model/trained/versions'
+    # Flat pre-registry layout, served until the first version is published
+    LEGACY_MODEL_DIR = 'ml_model/trained'
+    MODEL_REGISTRY_KEEP = 5
+    # Seconds between checks of CURRENT by each API process; 0 disables hot reload
+    MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
+    PREDICTION_CACHE_ENABLED = os.environ.get('PREDICTION_CACHE_ENABLED', '1') == '1'
+    PREDICTION_CACHE_SIZE = 4096
+    PREDICTION_CACHE_TTL = 600
+    # Training precomputes predictions for experience 0..N years x every education level; 0 disables
+    PREDICTION_GRID_MAX_EXPERIENCE = 40
+    # Recall / precision the 'high_recall' and 'high_precision' operating points must reach
+    OPERATING_POINT_TARGET = 0.9
+    # int8 / pruned variant exported next to each model (ml_model/predictorCompact.py)
+    COMPACT_MODEL_ENABLED = True
+    COMPACT_SPARSITY = float(os.environ.get('COMPACT_SPARSITY', 0.5))
+    COMPACT_MAX_ACCURACY_DROP = 0.01
+    # Serve the compact variant when the active version has one
+    SERVE_COMPACT = os.environ.get('SERVE_COMPACT') == '1'
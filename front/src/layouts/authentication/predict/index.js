@@ -11,6 +11,7 @@ function PredictForm() {
   const [experience, setExperience] = useState('');
   const [skills, setSkills] = useState('');
   const [predictionResult, setPredictionResult] = useState(null);
+  const [probability, setProbability] = useState(null);
 
   const handlePredict = async () => {
     const inputData = {
@@ -30,6 +31,7 @@ function PredictForm() {
 
       const data = await response.json();
       setPredictionResult(data.prediction);
+      setProbability(data.probability ?? null);
     } catch (error) {
       console.error('Error sending prediction request:', error);
     }
@@ -85,6 +87,11 @@ function PredictForm() {
                 <MDTypography variant="h5">
                 Résultat de la prédiction: {predictionResult}
                 </MDTypography>
+                {probability !== null && (
+                  <MDTypography variant="body2">
+                    Score d'employabilité: {(probability * 100).toFixed(1)}%
+                  </MDTypography>
+                )}
               </MDBox>
             )}
           </MDBox>
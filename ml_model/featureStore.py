@@ -0,0 +1,72 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+# Bump when FEATURE_PIPELINE / extract_feature_columns change meaning, so old snapshots are not reused
+FEATURE_VERSION = 1
+
+class FeatureStore:
+    """ Versioned columnar store of extracted training features.
+
+    Each snapshot is a directory of one .npy file per column plus a manifest,
+    keyed by a snapshot ID derived from the contents of the jobs collection.
+    Columns are read back memory-mapped, so repeated experiments on the same
+    data skip both Mongo and the flattening step without copying.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def snapshot_id(self, collection, pipeline):
+        """ Identify the current data by a checksum of the rows the feature pipeline produces.
+
+        Computed in Mongo with one $group over the pipeline's output: the row count,
+        each field's sum, and the sum and sum of squares of a per-row key mixing all
+        fields. Editing a document, or deleting one and inserting another, changes
+        the ID even when the count and newest _id stay the same. Rows whose features
+        are unchanged keep it, since the snapshot would be identical anyway.
+        """
+        fields = list(pipeline[-1]['$project'])
+        fields.remove('_id')
+        # Experience on top, then one bit per 0/1 field; the squares catch e.g. a label moving between rows
+        key = {'$add': [{'$multiply': [f'${name}', 2 ** (len(fields) - 1 - n)]} for n, name in enumerate(fields)]}
+        group = {'_id': None, 'rows': {'$sum': 1}, 'key': {'$sum': key}, 'key_squares': {'$sum': {'$multiply': [key, key]}},
+                 **{f'sum_{n}': {'$sum': f'${name}'} for n, name in enumerate(fields)}}
+        totals = next(iter(collection.aggregate(pipeline + [{'$group': group}])), {})
+        key = f"v{FEATURE_VERSION}:" + json.dumps({name: totals.get(name, 0) for name in sorted(group) if name != '_id'})
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def path(self, snapshot_id):
+        return os.path.join(self.root, snapshot_id)
+
+    def exists(self, snapshot_id):
+        return os.path.exists(os.path.join(self.path(snapshot_id), 'manifest.json'))
+
+    def write(self, snapshot_id, columns):
+        tmp_path = self.path(snapshot_id) + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for n, (name, values) in enumerate(columns.items()):
+            np.save(os.path.join(tmp_path, f'{n}.npy'), np.ascontiguousarray(values))
+        manifest = {
+            'snapshot_id': snapshot_id,
+            'feature_version': FEATURE_VERSION,
+            'columns': list(columns),
+            'rows': len(next(iter(columns.values()))) if columns else 0,
+            'created_at': datetime.datetime.now().isoformat(),
+        }
+        with open(os.path.join(tmp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        shutil.rmtree(self.path(snapshot_id), ignore_errors=True)
+        os.rename(tmp_path, self.path(snapshot_id))
+        print(f"Feature snapshot {snapshot_id} written ({manifest['rows']} rows).")
+
+    def read(self, snapshot_id, mmap_mode='r'):
+        path = self.path(snapshot_id)
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        # Column names (e.g. 'Bac +2') are kept in the manifest; files are numbered
+        return {name: np.load(os.path.join(path, f'{n}.npy'), mmap_mode=mmap_mode)
+                for n, name in enumerate(manifest['columns'])}
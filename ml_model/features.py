@@ -0,0 +1,127 @@
+import re
+import unicodedata
+import numpy as np
+
+# Feature engineering shared by the spiders, the API and every ml_model predictor.
+# The string transforms work on a whole column at once, so one request and a
+# million training rows go through the same code. Only NumPy is imported at module level;
+# the pandas helpers import it on use.
+
+EDUCATION_LEVELS = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
+FEATURE_COLUMNS = ['experience_required'] + EDUCATION_LEVELS
+# Longest digit run parsed in NumPy; every 18-digit number fits in int64
+MAX_DIGITS = 18
+
+def education_matrix(texts):
+    """ Map study-level strings to the cumulative 6-level education vector.
+
+    'Bac +3' -> [1, 1, 1, 0, 0, 0]; a plain 'Bac' sets only the first level and
+    'Doctorat' / 'Doctorate' sets all six. Returns an (n, 6) int8 array.
+    """
+    texts = np.asarray(texts, dtype=str).reshape(-1)
+    has = lambda needle: np.char.find(texts, needle) >= 0
+    # Highest level mentioned; the vector is every level up to and including it
+    rank = np.zeros(len(texts), dtype=np.int8)
+    rank[has('Bac') & ~has('Bac +')] = 1
+    for level, needle in [(2, 'Bac +2'), (3, 'Bac +3'), (4, 'Bac +4'), (5, 'Bac +5')]:
+        rank = np.maximum(rank, np.where(has(needle), level, 0).astype(np.int8))
+    rank[has('Doctorat')] = 6  # also matches 'Doctorate'
+    return (rank[:, None] > np.arange(len(EDUCATION_LEVELS))).astype(np.int8)
+
+def feature_grid(max_experience):
+    """ Every /predict input reachable from study_level: experience 0..max_experience x the 7 education vectors. """
+    experience = np.arange(max_experience + 1, dtype=np.float64)
+    education = (np.arange(len(EDUCATION_LEVELS) + 1)[:, None] > np.arange(len(EDUCATION_LEVELS))).astype(np.float64)
+    return np.column_stack([np.repeat(experience, len(education)), np.tile(education, (len(experience), 1))])
+
+def education_flags(text):
+    """ Single-string form of education_matrix, as the {level: 0/1} dict stored on jobs and stats. """
+    return dict(zip(EDUCATION_LEVELS, education_matrix([text])[0].tolist()))
+
+def experience_numbers(texts):
+    """ Parse the integers out of experience strings ('De 3 à 5 ans' -> 3, 5).
+
+    Works on the code points of the whole column at once: the digits (anything
+    re's \\d matches, so non-ASCII digits too) are located, split into runs,
+    weighted by their place value and summed per run with reduceat. Returns
+    (numbers, counts, overflow): numbers is an (n, k) int64 array with k the most
+    numbers found in any string, counts how many each string had, and overflow
+    marks strings with a digit run longer than MAX_DIGITS, which are left
+    unparsed (see experience_lists).
+    """
+    texts = np.asarray(texts, dtype=str).reshape(-1)
+    width = max(texts.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(texts, dtype=f'<U{width}').view(np.uint32).reshape(-1)
+
+    values = codes - np.uint32(ord('0'))  # wraps around for code points below '0'
+    digits = values < 10
+    for code in np.unique(codes[codes >= 0x660]).tolist():  # U+0660 is the first non-ASCII decimal digit
+        if chr(code).isdecimal():
+            hit = codes == code
+            values[hit] = unicodedata.decimal(chr(code))
+            digits |= hit
+
+    # Only the digit positions from here on; a run is consecutive positions within one string
+    position = np.flatnonzero(digits)
+    row = position // width
+    starts = np.ones(len(position), dtype=bool)
+    starts[1:] = (position[1:] != position[:-1] + 1) | (row[1:] != row[:-1])
+    first = np.flatnonzero(starts)
+    length = np.diff(np.append(first, len(position)))
+    run_row = row[first]
+
+    overflow = np.zeros(len(texts), dtype=bool)
+    overflow[run_row[length > MAX_DIGITS]] = True
+    exponent = np.repeat(first + length - 1, length) - np.arange(len(position))
+    place = (10 ** np.arange(MAX_DIGITS, dtype=np.int64))[np.minimum(exponent, MAX_DIGITS - 1)]
+    run_value = np.add.reduceat(values[position].astype(np.int64) * place, first) if len(first) else np.zeros(0, dtype=np.int64)
+
+    counts = np.bincount(run_row, minlength=len(texts))
+    k = np.arange(len(first)) - (np.cumsum(counts) - counts)[run_row]  # 0 for a string's first number, 1 for its second, ...
+    keep = ~overflow[run_row]
+    numbers = np.zeros((len(texts), max(int(counts.max(initial=0)), 1)), dtype=np.int64)
+    numbers[run_row[keep], k[keep]] = run_value[keep]
+    return numbers, counts, overflow
+
+def experience_lists(texts):
+    """ The integers in each experience string, [0] when it has none: 'De 3 à 5 ans' -> [3, 5].
+
+    Same result as [int(n) for n in re.findall(r'\\d+', text)] or [0] per string;
+    strings with a digit run too long for int64 take that regex path.
+    """
+    texts = np.asarray(texts, dtype=str).reshape(-1)
+    numbers, counts, overflow = experience_numbers(texts)
+    # Rows with the same count convert with one tolist(), then go back to their original order
+    order = np.argsort(counts, kind='stable')
+    sizes = np.bincount(counts, minlength=1)
+    grouped = [[0] for _ in range(sizes[0])]
+    edge = sizes[0]
+    for count in range(1, len(sizes)):
+        grouped += numbers[order[edge:edge + sizes[count]], :count].tolist()
+        edge += sizes[count]
+    lists = np.empty(len(texts), dtype=object)
+    lists[order] = np.fromiter(grouped, dtype=object, count=len(grouped))
+    lists = lists.tolist()
+    for i in np.flatnonzero(overflow).tolist():
+        lists[i] = [int(n) for n in re.findall(r'\d+', str(texts[i]))]
+    return lists
+
+def first_element(series):
+    """ First item of list-valued cells (sector_activity, function); None for anything else. """
+    import pandas as pd
+    return pd.Series([x[0] if isinstance(x, list) and x else None for x in series], index=series.index, dtype=object)
+
+def first_experience(series):
+    """ First experience value of the stored experience_required column.
+
+    Employable jobs store [[min, max]] and the synthetic non-employable ones
+    [min, max]; both yield min. Empty or malformed cells yield 0. List cells
+    cannot be vectorized; this is a plain per-row apply.
+    """
+    return series.apply(_first_number).astype(float)
+
+def _first_number(cell):
+    first = cell[0] if isinstance(cell, list) and cell else None
+    if isinstance(first, list):
+        first = first[0] if first else None
+    return first if isinstance(first, (int, float)) and not isinstance(first, bool) else 0
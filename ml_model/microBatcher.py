@@ -0,0 +1,104 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class MicroBatcher:
+    """ Collect concurrent single-record predictions into one batched forward pass.
+
+    Requests are queued and a background thread drains up to max_batch_size of
+    them, waiting at most max_wait_ms after the oldest one arrived, then calls
+    predict_fn once with the list of records and resolves each caller's future.
+    A request that finds the queue empty is dispatched at once rather than
+    waiting for company. If a batch raises, its records are retried one by one
+    so a malformed record only fails its own caller.
+    """
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.batch_sizes = {}
+        self.batches = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_observed_wait = 0.0
+        self.thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self.thread.start()
+
+    def submit(self, record):
+        future = Future()
+        self.queue.put((record, future, time.perf_counter()))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.perf_counter()
+                    if len(batch) == 1 or remaining <= 0:
+                        break  # nothing else waiting: don't delay a lone request
+                    try:
+                        entry = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if entry is None:
+                    self.queue.put(None)  # finish this batch, stop on the next loop
+                    break
+                batch.append(entry)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        try:
+            results = self.predict_fn([record for record, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                for record, future, _ in batch:
+                    self._run_one(record, future)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+        waits = [started - enqueued for _, _, enqueued in batch]
+        with self.lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+            self.total_wait += sum(waits)
+            self.max_observed_wait = max(self.max_observed_wait, max(waits))
+
+    def _run_one(self, record, future):
+        try:
+            future.set_result(self.predict_fn([record])[0])
+        except Exception as e:
+            future.set_exception(e)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'queue_depth': self.queue.qsize(),
+                'batches': self.batches,
+                'requests': self.requests,
+                'batch_size_histogram': dict(sorted(self.batch_sizes.items())),
+                'mean_batch_size': self.requests / self.batches if self.batches else 0,
+                'mean_wait_ms': 1000 * self.total_wait / self.requests if self.requests else 0,
+                'max_wait_ms': 1000 * self.max_observed_wait,
+            }
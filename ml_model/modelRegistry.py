@@ -0,0 +1,191 @@
+import collections
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from config import Config
+
+# File names inside a version directory (the legacy flat ml_model/trained layout uses the same names)
+KERAS_MODEL = 'model.h5'
+SCALER = 'scaler.npz'
+NUMPY_MODEL = 'model_numpy.npz'
+MMAP_MODEL = 'model_mmap'
+TRAINING_REPORT = 'training_report.json'
+PREDICTION_GRID = 'prediction_grid.npz'
+COMPACT_PREDICTION_GRID = 'prediction_grid_compact.npz'
+OPERATING_POINTS = 'operating_points.json'
+COMPACT_MODEL = 'model_compact.npz'
+COMPACT_MMAP_MODEL = 'model_compact_mmap'
+META = 'meta.json'
+CURRENT = 'CURRENT'
+
+class ModelRegistry:
+    """ Versioned model artifacts with an atomically switched "current" pointer.
+
+    Training writes into a private staging directory and publishes it with one
+    rename; the CURRENT file is then replaced (os.replace) to point at the new
+    version. Readers therefore see either the previous complete version or the
+    new one, and a failed or running retrain never leaves the API without a model.
+    """
+    def __init__(self, root, legacy_dir=None, keep=5):
+        self.root = root
+        self.legacy_dir = legacy_dir
+        self.keep = keep
+
+    def path(self, version):
+        return os.path.join(self.root, version)
+
+    def current(self):
+        try:
+            with open(os.path.join(self.root, CURRENT)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def resolve(self):
+        """ (version, path) of the model to serve: the current version, else the legacy flat layout. """
+        version = self.current()
+        if version:
+            return version, self.path(version)
+        if self.legacy_dir and os.path.exists(os.path.join(self.legacy_dir, KERAS_MODEL)):
+            return 'legacy', self.legacy_dir
+        return None, None
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if not name.startswith('.') and os.path.isdir(self.path(name)))
+
+    def meta(self, version):
+        try:
+            with open(os.path.join(self.path(version), META)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def begin(self):
+        """ New empty staging directory for a training run's artifacts. """
+        staging = os.path.join(self.root, f'.staging-{uuid.uuid4().hex}')
+        os.makedirs(staging)
+        return staging
+
+    def abort(self, staging):
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def commit(self, staging, meta=None):
+        """ Publish a staging directory as a new version and make it current. """
+        created_at = datetime.datetime.now()
+        # Sortable by creation time; the suffix keeps concurrent commits apart
+        version = f"{created_at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:6]}"
+        with open(os.path.join(staging, META), 'w') as f:
+            json.dump({**(meta or {}), 'version': version, 'created_at': created_at.isoformat()}, f, indent=2, default=str)
+        os.rename(staging, self.path(version))
+        self.set_current(version)
+        self.prune()
+        print(f"Model version {version} is now current.")
+        return version
+
+    def set_current(self, version):
+        """ Point CURRENT at an existing version (also used to roll back). """
+        if not os.path.isdir(self.path(version)):
+            raise ValueError(f"Unknown model version {version}")
+        tmp_path = os.path.join(self.root, f'.{CURRENT}-{uuid.uuid4().hex}')
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.root, CURRENT))
+
+    def prune(self):
+        """ Delete the oldest versions beyond self.keep, never the current one. """
+        current = self.current()
+        old = [version for version in self.versions() if version != current]
+        for version in old[:max(len(old) - (self.keep - 1), 0)]:
+            # Processes still serving it keep their open and memory-mapped files until they reload
+            shutil.rmtree(self.path(version), ignore_errors=True)
+
+def is_version(path):
+    """ Whether path is a committed version. Only there were the exports written by the same training run as model.h5;
+    files in the legacy flat layout may be left over from another model and are not served. """
+    return os.path.exists(os.path.join(path, META))
+
+def get_registry():
+    return ModelRegistry(Config.MODEL_REGISTRY_DIR, legacy_dir=Config.LEGACY_MODEL_DIR, keep=Config.MODEL_REGISTRY_KEEP)
+
+LoadedModel = collections.namedtuple('LoadedModel', 'version path predictor loaded_at load_seconds')
+
+class ActiveModel:
+    """ The predictor currently serving requests, hot-swapped when the registry's current version changes.
+
+    The new version is loaded in the background while the old one keeps serving;
+    the swap is a single reference assignment, so a request uses either model in
+    full and none is dropped. Listeners are called with the new LoadedModel after a swap.
+    """
+    def __init__(self, registry, loader, listeners=()):
+        self.registry = registry
+        self.loader = loader
+        self.listeners = list(listeners)
+        self.loaded = None
+        self.failed_version = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self.reload()
+
+    @property
+    def predictor(self):
+        return self.loaded.predictor
+
+    @property
+    def version(self):
+        return self.loaded.version
+
+    def reload(self):
+        """ Load the registry's current version if it is not the one being served. Returns True on a swap. """
+        with self._lock:
+            version, path = self.registry.resolve()
+            if version is None:
+                raise FileNotFoundError(f"No trained model in {self.registry.root} or {self.registry.legacy_dir}")
+            if self.loaded and version == self.loaded.version:
+                return False
+            start = time.perf_counter()
+            predictor = self.loader(path)
+            self.loaded = LoadedModel(version, path, predictor, datetime.datetime.now(), time.perf_counter() - start)
+            self.failed_version = None
+        print(f"Serving model version {version} (loaded in {self.loaded.load_seconds:.3f}s).")
+        for listener in self.listeners:
+            listener(self.loaded)
+        return True
+
+    def start_watcher(self, interval):
+        if interval <= 0 or self._watcher:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            version = self.registry.current() or 'legacy'
+            if version in (self.loaded.version, self.failed_version):
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep serving the previous version; retry only once CURRENT changes again
+                self.failed_version = version
+                print(f"Failed to load model version {version}, still serving {self.loaded.version}:", e)
+
+    def info(self):
+        loaded = self.loaded
+        return {
+            'version': loaded.version,
+            'path': loaded.path,
+            'backend': type(loaded.predictor).__module__,
+            'loaded_at': loaded.loaded_at.isoformat(),
+            'load_seconds': loaded.load_seconds,
+            'meta': self.registry.meta(loaded.version) if loaded.version != 'legacy' else {},
+        }
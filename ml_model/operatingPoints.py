@@ -0,0 +1,81 @@
+import json
+import numpy as np
+
+# Decision thresholds for the MLP's probability output. Training evaluates the
+# test split at a range of thresholds and saves the table with a few named
+# operating points next to the model, so the API can serve any of them from
+# the same forward pass.
+
+DEFAULT_THRESHOLD = 0.5
+
+def threshold_table(y_true, probabilities, target=0.9, max_rows=101):
+    """ Precision/recall/FPR at up to max_rows thresholds, plus the named operating points.
+
+    A record is classed employable when probability > threshold, as in predict().
+    'high_recall' is the highest threshold keeping recall >= target and
+    'high_precision' the lowest reaching precision >= target.
+    """
+    from sklearn.metrics import roc_auc_score
+    y_true = np.asarray(y_true).astype(bool).reshape(-1)
+    probabilities = np.asarray(probabilities, dtype=np.float64).reshape(-1)
+    thresholds = np.unique(np.concatenate([
+        np.quantile(probabilities, np.linspace(0, 1, max_rows - 1)) if len(probabilities) else [],
+        [DEFAULT_THRESHOLD],
+    ]))
+
+    predicted = probabilities[None, :] > thresholds[:, None]
+    tp = (predicted & y_true).sum(axis=1)
+    fp = (predicted & ~y_true).sum(axis=1)
+    positives, negatives = y_true.sum(), (~y_true).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        recall = np.where(positives, tp / positives, 0.0)
+        fpr = np.where(negatives, fp / negatives, 0.0)
+        precision = np.where(tp + fp, tp / (tp + fp), 1.0)
+        f1 = np.where(precision + recall, 2 * precision * recall / (precision + recall), 0.0)
+    accuracy = (tp + negatives - fp) / max(len(y_true), 1)
+
+    table = [{'threshold': float(t), 'precision': float(p), 'recall': float(r), 'fpr': float(f), 'f1': float(s), 'accuracy': float(a)}
+             for t, p, r, f, s, a in zip(thresholds, precision, recall, fpr, f1, accuracy)]
+    points = {
+        'default': table[int(np.flatnonzero(thresholds == DEFAULT_THRESHOLD)[0])],
+        'balanced': table[int(np.argmax(recall - fpr))],  # Youden's J
+        'max_f1': table[int(np.argmax(f1))],
+        'max_accuracy': table[int(np.argmax(accuracy))],
+    }
+    reaching_recall = np.flatnonzero(recall >= target)
+    if len(reaching_recall):
+        points['high_recall'] = table[int(reaching_recall[-1])]
+    reaching_precision = np.flatnonzero(precision >= target)
+    if len(reaching_precision):
+        points['high_precision'] = table[int(reaching_precision[0])]
+
+    auc = float(roc_auc_score(y_true, probabilities)) if 0 < positives < len(y_true) else None
+    return {'rows': int(len(y_true)), 'auc': auc, 'target': target, 'operating_points': points, 'table': table}
+
+def save_operating_points(path, table):
+    with open(path, 'w') as f:
+        json.dump(table, f, indent=2)
+    print("Operating points:", ", ".join(f"{name}={point['threshold']:.3f}" for name, point in table['operating_points'].items()))
+
+def load_operating_points(path):
+    """ {name: threshold} saved with a model version, or {} if it has none. """
+    try:
+        with open(path) as f:
+            table = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {name: point['threshold'] for name, point in table['operating_points'].items()}
+
+def resolve_threshold(args, operating_points):
+    """ Threshold for one request: ?threshold=<0..1>, or ?operating_point=<name>, else 0.5. """
+    if args.get('threshold') is not None:
+        threshold = float(args['threshold'])
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError(f"threshold must be between 0 and 1, got {threshold}")
+        return threshold
+    name = args.get('operating_point')
+    if name:
+        if name not in operating_points:
+            raise ValueError(f"Unknown operating point '{name}'; available: {sorted(operating_points)}")
+        return operating_points[name]
+    return DEFAULT_THRESHOLD
@@ -0,0 +1,104 @@
+import collections
+import threading
+import time
+import numpy as np
+from ml_model.features import FEATURE_COLUMNS
+from ml_model.predictorNumpy import to_numeric
+
+class PredictionCache:
+    """ LRU/TTL cache of model probabilities keyed on the normalized feature tuple.
+
+    Probabilities rather than classes are cached, so one entry serves every
+    decision threshold.
+
+    Entries belong to one model version: invalidate() is called on every model
+    swap and drops them all. A version's precomputed grid (see save_grid) is
+    loaded alongside and never evicted, so the common inputs are a dict lookup.
+    """
+    def __init__(self, max_size=4096, ttl=600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = None
+        self._entries = collections.OrderedDict()  # key -> (prediction, expires_at)
+        self._grid = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.grid_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(input_data):
+        """ The model's input exactly as predict() sees it: to_numeric of each feature column. """
+        return tuple(to_numeric(input_data[col]) for col in FEATURE_COLUMNS)
+
+    def get(self, key):
+        """ Cached prediction for key, or None. """
+        with self._lock:
+            prediction = self._grid.get(key)
+            if prediction is not None:
+                self.hits += 1
+                self.grid_hits += 1
+                return prediction
+            entry = self._entries.get(key)
+            if entry is not None:
+                prediction, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return prediction
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, prediction, version):
+        """ Cache a prediction made by `version`; ignored if the model has been swapped since. """
+        with self._lock:
+            if version != self.version or self.max_size <= 0:
+                return
+            self._entries[key] = (prediction, time.monotonic() + self.ttl if self.ttl else float('inf'))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, version, grid=None):
+        """ Drop every entry and start caching for `version`, preloaded with its grid if any. """
+        with self._lock:
+            self.version = version
+            self._entries.clear()
+            self._grid = dict(grid or {})
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self.version,
+                'size': len(self._entries),
+                'grid_size': len(self._grid),
+                'hits': self.hits,
+                'grid_hits': self.grid_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+def save_grid(path, predictor, features):
+    """ Predict every row of a feature grid (see features.feature_grid) and save it next to the model. """
+    records = [dict(zip(FEATURE_COLUMNS, row)) for row in features.tolist()]
+    probabilities = np.asarray(list(predictor.predict_proba_batch(records, chunk_size=len(records))))
+    np.savez(path, features=features, probabilities=probabilities)
+    print(f"Prediction grid of {len(records)} inputs saved to", path)
+
+def load_grid(path):
+    """ {feature tuple: probability} from a saved grid, or {} if the version has none. """
+    try:
+        grid = np.load(path)
+    except FileNotFoundError:
+        return {}
+    if 'probabilities' not in grid.files:
+        return {}  # grids written before probabilities were cached hold classes
+    return dict(zip(map(tuple, grid['features'].tolist()), grid['probabilities'].tolist()))
@@ -1,66 +1,82 @@
-import pandas as pd
 import numpy as np
 from pymongo import MongoClient
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import MinMaxScaler
-import tensorflow as tf
 from config import Config
 import os
-import numpy as np
-import shutil
+import threading
+from ml_model.features import FEATURE_COLUMNS, feature_grid
+from ml_model.predictorNumpy import to_numeric
+from ml_model import predictorNumpy, predictorCompact
+from ml_model.featureStore import FeatureStore
+from ml_model.trainingLog import TrainingLog
+from ml_model.modelRegistry import get_registry, KERAS_MODEL, SCALER, NUMPY_MODEL, MMAP_MODEL, TRAINING_REPORT, PREDICTION_GRID, OPERATING_POINTS, COMPACT_MODEL, COMPACT_MMAP_MODEL, COMPACT_PREDICTION_GRID
+from ml_model.operatingPoints import threshold_table, save_operating_points
+from ml_model.predictionCache import save_grid
+
+# pandas, scikit-learn and TensorFlow are imported inside the methods that need
+# them so that importing this module (and serving from an exported model) stays cheap.
 
 class EmploymentPredictor:
     def __init__(self):
-        self.client = MongoClient(Config.MONGO_URI)
-        self.db = self.client[Config.DATABASE_NAME]
-        self.jobs_collection = self.db[Config.JOBS_COLLECTION]
+        self.client = None
+        self._jobs_collection = None
         self.model = None
-        self.scaler = MinMaxScaler()
+        self.scaler = None
+        # Named decision thresholds of the loaded version (ml_model.operatingPoints), set by the caller
+        self.operating_points = {}
+        self._buffers = threading.local()
+
+    @property
+    def jobs_collection(self):
+        # Only training touches MongoDB, so connect on first use
+        if self._jobs_collection is None:
+            self.client = MongoClient(Config.MONGO_URI)
+            self.db = self.client[Config.DATABASE_NAME]
+            self._jobs_collection = self.db[Config.JOBS_COLLECTION]
+        return self._jobs_collection
 
     def ensure_directory(self, directory):
         if not os.path.exists(directory):
             os.makedirs(directory)
 
     def extract_data(self):
-        jobs_data = list(self.jobs_collection.find({}, projection={
-            '_id': False, 
-            'experience_required': True, 
-            'study_level_required': True, 
-            'Employable': True
-        }))
-        self.data = pd.DataFrame(jobs_data)
+        import pandas as pd
+        self.data = pd.DataFrame(self.load_feature_columns(), copy=False)
+        if Config.DEBUG_DUMPS:
+            self.ensure_directory('debugData')
+            self.data.to_csv('debugData/extracted_data.csv', index=False)
         self.preprocess_data()
-        self.ensure_directory('debugData')
-        self.data.to_csv('debugData/extracted_data.csv', index=False)
-
-    def preprocess_data(self):
-        # Flatten and convert 'experience_required' to numeric by taking the first value of the nested list
-        self.should_remember_user = False
-        self.data['experience_required'] = self.data['experience_required'].apply(
-            lambda x: float(x[0][0]) if isinstance(x, list) and len(x) > 0 and isinstance(x[0], list) and len(x[0]) > 0 else (float(x[0]) if isinstance(x, list) and len(x) > 0 else 0.0)
-        )
 
-        # Extract study level fields and ensure they are numeric
-        for level in ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']:
-            self.data[level] = self.data['study_level_required'].apply(lambda x: float(x.get(level, 0)) if isinstance(x, dict) and level in x else 0)
+    def load_feature_columns(self):
+        """ Feature columns of the current (or pinned) snapshot, extracting it first if needed. """
+        store = FeatureStore(Config.FEATURE_STORE_DIR)
+        snapshot_id = Config.FEATURE_SNAPSHOT or store.snapshot_id(self.jobs_collection, FEATURE_PIPELINE)
+        if store.exists(snapshot_id):
+            columns = store.read(snapshot_id)
+            print(f"Using feature snapshot {snapshot_id}.")
+        else:
+            # Nested fields are flattened by Mongo and decoded straight into NumPy columns
+            columns = extract_feature_columns(self.jobs_collection, Config.EXTRACT_BATCH_SIZE)
+            store.write(snapshot_id, columns)
+        self.snapshot_id = snapshot_id
+        return columns
 
-        # Specify numeric columns explicitly to include 'experience_required' and the education levels
+    def preprocess_data(self):
+        from sklearn.preprocessing import MinMaxScaler
+        self.scaler = MinMaxScaler()
+        # 'experience_required' and the education levels arrive already flattened, numeric
+        # and NaN-free from extract_feature_columns (see FEATURE_PIPELINE)
         numeric_cols = ['experience_required', 'Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
-        
-        # Convert columns to numeric, coercing errors to NaN
-        self.data[numeric_cols] = self.data[numeric_cols].apply(pd.to_numeric, errors='coerce')
-
-        # Fill NaNs with zero or another appropriate value after attempting conversion
-        self.data.fillna(0, inplace=True)
 
         # Apply MinMaxScaler
         self.data[numeric_cols] = self.scaler.fit_transform(self.data[numeric_cols])
 
-        self.data.to_csv('debugData/preprocessed_data.csv', index=False)
-        print("Data preprocessed and saved to 'debugData/preprocessed_data.csv'.")
+        if Config.DEBUG_DUMPS:
+            self.data.to_csv('debugData/preprocessed_data.csv', index=False)
+            print("Data preprocessed and saved to 'debugData/preprocessed_data.csv'.")
 
 
     def split_data(self):
+        from sklearn.model_selection import train_test_split
         # Define the columns to include in the model
         feature_columns = ['experience_required', 'Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
         
@@ -74,51 +90,213 @@ class EmploymentPredictor:
         # Split the data into training and testing sets
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
-        
-        # Ensure the directory exists for saving CSV files
-        self.ensure_directory('debugData')
-        
-        # Save the split data into CSV files for debugging or further use
-        self.X_train.to_csv('debugData/training_data.csv', index=False)
-        self.y_train.to_csv('debugData/training_labels.csv', index=False)
-        self.X_test.to_csv('debugData/testing_data.csv', index=False)
-        self.y_test.to_csv('debugData/testing_labels.csv', index=False)
-
-
-    def build_model(self):
-        input_shape = self.X_train.shape[1]  # Ensures correct input shape is used
-        self.model = tf.keras.Sequential([
-            tf.keras.layers.Dense(512, activation='relu', input_shape=(input_shape,)),
-            tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.BatchNormalization(),
-            tf.keras.layers.Dense(256, activation='relu'),
-            tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.BatchNormalization(),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
-        self.model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-
-    def train_model(self):
-        delete_existing_model('ml_model/trained/model.h5')
-        delete_existing_model('ml_model/trained/scaler.npz')
+
+        if Config.DEBUG_DUMPS:
+            # Save the split data into CSV files for debugging
+            self.ensure_directory('debugData')
+            self.X_train.to_csv('debugData/training_data.csv', index=False)
+            self.y_train.to_csv('debugData/training_labels.csv', index=False)
+            self.X_test.to_csv('debugData/testing_data.csv', index=False)
+            self.y_test.to_csv('debugData/testing_labels.csv', index=False)
+
+
+    def build_model(self, units=(512, 256), dropout=0.2, learning_rate=0.001, input_shape=None):
+        import tensorflow as tf
+        input_shape = input_shape or self.X_train.shape[1]  # Ensures correct input shape is used
+        layers = [tf.keras.Input(shape=(input_shape,))]
+        for width in units:
+            layers += [
+                tf.keras.layers.Dense(width, activation='relu'),
+                tf.keras.layers.Dropout(dropout),
+                tf.keras.layers.BatchNormalization(),
+            ]
+        self.model = tf.keras.Sequential(layers + [tf.keras.layers.Dense(1, activation='sigmoid')])
+        self.model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate), loss='binary_crossentropy', metrics=['accuracy'])
+
+    def train_model(self, warm_start=False):
+        import tensorflow as tf
+        configure_threads(Config.TRAIN_THREADS)
         self.build_model()
-        #if not self.model:
-        #    self.build_model()
-        self.model.fit(self.X_train, self.y_train, epochs=2000, batch_size=64, validation_data=(self.X_test, self.y_test), callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=100, restore_best_weights=True)])
-        self.model.save('ml_model/trained/model.h5')
-        np.savez('ml_model/trained/scaler.npz', scale=self.scaler.scale_, min_=self.scaler.min_)
+        registry = get_registry()
+        _, previous_path = registry.resolve()
+        if warm_start and previous_path and os.path.exists(os.path.join(previous_path, KERAS_MODEL)):
+            # Start from the previous weights so early stopping converges in far fewer epochs
+            self.model.set_weights(tf.keras.models.load_model(os.path.join(previous_path, KERAS_MODEL)).get_weights())
+            print("Warm-starting from the previous model weights.")
+        log = TrainingLog(self.model)
+        if Config.TRAIN_PIPELINE == 'tfdata':
+            self.fit_dataset(log)
+        else:
+            log_callback = log.callback(64)
+            self.model.fit(self.X_train, self.y_train, epochs=2000, batch_size=64, validation_data=(self.X_test, self.y_test), callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=100, restore_best_weights=True), log_callback])
+
+        # Artifacts go to a staging directory that is published as a new version in one step;
+        # until then (or if anything below fails) the previous version stays current
+        staging = registry.begin()
+        try:
+            self.training_report = log.save(os.path.join(staging, TRAINING_REPORT), pipeline=Config.TRAIN_PIPELINE,
+                                            threads=Config.TRAIN_THREADS, rows=len(self.X_train))
+            self.model.save(os.path.join(staging, KERAS_MODEL))
+            np.savez(os.path.join(staging, SCALER), scale=self.scaler.scale_, min_=self.scaler.min_)
+            self.export_numpy_model(os.path.join(staging, NUMPY_MODEL))
+            engine = self.check_numpy_export(os.path.join(staging, NUMPY_MODEL))
+            engine.save_folded(os.path.join(staging, MMAP_MODEL))
+            # One table of thresholds from the test split serves every operating point at inference
+            probabilities = engine.forward(np.asarray(self.X_test, dtype=np.float32))[:, 0]
+            operating_points = threshold_table(self.y_test, probabilities, target=Config.OPERATING_POINT_TARGET)
+            save_operating_points(os.path.join(staging, OPERATING_POINTS), operating_points)
+            if Config.PREDICTION_GRID_MAX_EXPERIENCE:
+                save_grid(os.path.join(staging, PREDICTION_GRID), engine, feature_grid(Config.PREDICTION_GRID_MAX_EXPERIENCE))
+            compact_check = self.export_compact_model(engine, os.path.join(staging, COMPACT_MODEL)) if Config.COMPACT_MODEL_ENABLED else None
+        except Exception:
+            registry.abort(staging)
+            raise
+        self.model_version = registry.commit(staging, meta={
+            'snapshot_id': getattr(self, 'snapshot_id', None),
+            'warm_start': bool(warm_start and previous_path),
+            'val_accuracy': self.training_report.get('val_accuracy'),
+            'val_loss': self.training_report.get('val_loss'),
+            'auc': operating_points['auc'],
+            'compact': compact_check,
+        })
+
+    def fit_dataset(self, log):
+        """ Train from a cached, prefetched tf.data pipeline with a growing batch-size schedule.
+
+        Each entry of Config.TRAIN_BATCH_SCHEDULE is one phase. Within a phase the
+        learning rate halves when val_loss plateaus and the phase ends once it stops
+        improving, which moves training on to the next, larger batch size. The
+        weights of the best epoch over all phases are kept.
+        """
+        import tensorflow as tf
+        X_train = np.asarray(self.X_train, dtype=np.float32)
+        y_train = np.asarray(self.y_train, dtype=np.float32).reshape(-1, 1)
+        X_test = np.asarray(self.X_test, dtype=np.float32)
+        y_test = np.asarray(self.y_test, dtype=np.float32).reshape(-1, 1)
+
+        options = tf.data.Options()
+        if Config.TRAIN_THREADS:
+            options.threading.private_threadpool_size = Config.TRAIN_THREADS
+        # Cache the decoded tensors once; shuffling and batching run on the cached copy every epoch
+        train = tf.data.Dataset.from_tensor_slices((X_train, y_train)).cache()
+        validation = (tf.data.Dataset.from_tensor_slices((X_test, y_test))
+                      .batch(max(Config.TRAIN_BATCH_SCHEDULE)).cache().prefetch(tf.data.AUTOTUNE).with_options(options))
+
+        epoch = 0
+        for batch_size in Config.TRAIN_BATCH_SCHEDULE:
+            dataset = (train.shuffle(len(X_train), reshuffle_each_iteration=True)
+                       .batch(batch_size).prefetch(tf.data.AUTOTUNE).with_options(options))
+            history = self.model.fit(dataset, validation_data=validation, initial_epoch=epoch,
+                                     epochs=epoch + Config.TRAIN_PHASE_EPOCHS, verbose=2, callbacks=[
+                tf.keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=max(Config.TRAIN_PATIENCE // 2, 1), min_lr=1e-5),
+                tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=Config.TRAIN_PATIENCE),
+                log.callback(batch_size),
+            ])
+            epoch += len(history.epoch)
+        log.restore_best()
+
+    def export_numpy_model(self, path):
+        """ Save weights, BatchNormalization statistics and scaler for ml_model.predictorNumpy. """
+        import tensorflow as tf
+        arrays = {'scale': self.scaler.scale_, 'min_': self.scaler.min_}
+        layers = []
+        for layer in self.model.layers:
+            n = len(layers)
+            if isinstance(layer, tf.keras.layers.Dense):
+                kernel, bias = layer.get_weights()
+                arrays[f'layer_{n}_kernel'] = kernel
+                arrays[f'layer_{n}_bias'] = bias
+                layers.append('dense:' + layer.activation.__name__)
+            elif isinstance(layer, tf.keras.layers.BatchNormalization):
+                gamma, beta, moving_mean, moving_variance = layer.get_weights()
+                arrays[f'layer_{n}_gamma'] = gamma
+                arrays[f'layer_{n}_beta'] = beta
+                arrays[f'layer_{n}_moving_mean'] = moving_mean
+                arrays[f'layer_{n}_moving_variance'] = moving_variance
+                arrays[f'layer_{n}_epsilon'] = np.array(layer.epsilon)
+                layers.append('batchnorm')
+            elif isinstance(layer, tf.keras.layers.Dropout):
+                continue  # identity at inference time
+            else:
+                raise ValueError(f"Cannot export layer {layer.name} ({type(layer).__name__})")
+        arrays['layers'] = np.array(layers)
+        np.savez(path, **arrays)
+        print("NumPy model exported to", path)
+
+    def export_compact_model(self, engine, path):
+        """ Save the int8 (optionally pruned) variant if its test-split accuracy stays within COMPACT_MAX_ACCURACY_DROP. """
+        compact = predictorCompact.EmploymentPredictor.from_engine(engine, sparsity=Config.COMPACT_SPARSITY)
+        check = predictorCompact.compare(engine, compact, np.asarray(self.X_test, dtype=np.float32), self.y_test)
+        print(f"Compact model - accuracy {check['compact_accuracy']:.4f} vs {check['reference_accuracy']:.4f}, "
+              f"sparsity {check['sparsity']:.0%}, max abs diff {check['max_abs_diff']:.2e}")
+        check['saved'] = check['accuracy_drop'] <= Config.COMPACT_MAX_ACCURACY_DROP
+        if check['saved']:
+            compact.save_model(path)
+            # What replicas actually load: int8 .npy files memory-mapped by every worker
+            compact.save_folded(os.path.join(os.path.dirname(path), COMPACT_MMAP_MODEL))
+            if Config.PREDICTION_GRID_MAX_EXPERIENCE:
+                # Grid hits and misses must agree, so the compact model gets a grid of its own predictions
+                save_grid(os.path.join(os.path.dirname(path), COMPACT_PREDICTION_GRID), compact, feature_grid(Config.PREDICTION_GRID_MAX_EXPERIENCE))
+        else:
+            print(f"Compact model not saved: accuracy drop {check['accuracy_drop']:.4f} exceeds {Config.COMPACT_MAX_ACCURACY_DROP}")
+        return check
+
+    def check_numpy_export(self, path, atol=1e-5):
+        """ Compare the exported NumPy engine against model.predict on the test split. """
+        engine = predictorNumpy.EmploymentPredictor()
+        engine.load_model(path)
+        X_test = np.asarray(self.X_test, dtype=np.float32)
+        expected = self.model.predict(X_test, verbose=0)
+        actual = engine.forward(X_test)
+        max_diff = float(np.max(np.abs(expected - actual))) if len(X_test) else 0.0
+        print(f"NumPy export parity - max abs diff: {max_diff:.2e}")
+        if max_diff > atol:
+            raise ValueError(f"NumPy export differs from Keras model by {max_diff:.2e}")
+        return engine
 
     def evaluate_model(self):
         results = self.model.evaluate(self.X_test, self.y_test)
         print(f"Model evaluation results - Loss: {results[0]}, Accuracy: {results[1]}")
 
     def load_model(self, model_path, scaler_path):
+        import tensorflow as tf
+        from sklearn.preprocessing import MinMaxScaler
+        self.scaler = MinMaxScaler()
         self.model = tf.keras.models.load_model(model_path)
         scaler_state = np.load(scaler_path)
         self.scaler.scale_ = scaler_state['scale']
         self.scaler.min_ = scaler_state['min_']
+        self._scale = np.asarray(self.scaler.scale_, dtype=np.float64)
+        self._min = np.asarray(self.scaler.min_, dtype=np.float64)
+
+    def predict(self, input_data, threshold=0.5):
+        return int(self.predict_proba(input_data) > threshold)
 
-    def predict(self, input_data):
+    def predict_proba(self, input_data):
+        """ Fast single-record path: no DataFrame, no per-call allocations. """
+        row, features = self._input_buffers()
+        for j, col in enumerate(FEATURE_COLUMNS):
+            row[j] = to_numeric(input_data[col])
+
+        # Same arithmetic as MinMaxScaler.transform (float64 x * scale_ + min_),
+        # cast once into the float32 model input so results match predict_pandas
+        np.multiply(row, self._scale, out=row)
+        np.add(row, self._min, out=row)
+        features[0] = row
+
+        prediction = self.model(features, training=False).numpy()
+        return float(prediction[0, 0])
+
+    def _input_buffers(self):
+        # One preallocated buffer pair per thread, reused across requests
+        buffers = self._buffers
+        if not hasattr(buffers, 'row'):
+            buffers.row = np.zeros(len(FEATURE_COLUMNS), dtype=np.float64)
+            buffers.features = np.zeros((1, len(FEATURE_COLUMNS)), dtype=np.float32)
+        return buffers.row, buffers.features
+
+    def predict_pandas(self, input_data):
+        import pandas as pd
         # Convert input_data dict into DataFrame
         input_df = pd.DataFrame([input_data])
 
@@ -140,25 +318,102 @@ class EmploymentPredictor:
         predicted_class = (prediction > 0.5).astype(int)  # Assuming binary classification with a threshold of 0.5
         return predicted_class[0][0]
 
+    def predict_proba_batch(self, records, chunk_size=1024):
+        """ Predict a stream of input dicts, yielding probabilities in input order.
+
+        Records are packed into one float matrix per chunk so scaling and the
+        forward pass run once per chunk instead of once per record.
+        """
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield from self._proba_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._proba_chunk(chunk)
+
+    def predict_batch(self, records, chunk_size=1024, threshold=0.5):
+        """ Predict a stream of input dicts, yielding classes in input order. """
+        for probability in self.predict_proba_batch(records, chunk_size):
+            yield int(probability > threshold)
+
+    def _proba_chunk(self, chunk):
+        features = np.zeros((len(chunk), len(FEATURE_COLUMNS)), dtype=np.float64)
+        for row, record in zip(features, chunk):
+            for j, col in enumerate(FEATURE_COLUMNS):
+                row[j] = to_numeric(record[col])
+
+        features *= self._scale
+        features += self._min
+        prediction = self.model.predict(features, batch_size=len(chunk), verbose=0)
+        return prediction[:, 0].tolist()
+
 
     
-    def full_pipeline(self):
+    def full_pipeline(self, warm_start=False):
         self.extract_data()
         self.split_data()
-        self.train_model()
+        self.train_model(warm_start=warm_start)
         self.evaluate_model()
 
 
-def delete_existing_model(model_path):
-    """ Delete existing model files to ensure clean state """
-    # Check if the file exists
-    if os.path.exists(model_path):
-        # If it's a directory (like TensorFlow model directory), delete the directory
-        if os.path.isdir(model_path):
-            shutil.rmtree(model_path)
-        else:
-            # If it's a file, delete the file
-            os.remove(model_path)
-        print("Deleted existing model at path:", model_path)
-    else:
-        print("No model found at path to delete:", model_path)
+# Server-side flattening of a job document into the model's feature columns:
+# the first experience value (experience_required is [[min, max]] for employable
+# items and [min, max] for the synthetic non-employable ones) and each education
+# flag, converted to double with missing / malformed values as 0.
+def _to_double(expression):
+    return {'$convert': {'input': expression, 'to': 'double', 'onError': 0.0, 'onNull': 0.0}}
+
+FEATURE_PIPELINE = [
+    {'$project': {
+        '_id': 0,
+        'experience_required': _to_double({'$let': {
+            'vars': {'first': {'$cond': [{'$isArray': '$experience_required'},
+                                         {'$arrayElemAt': ['$experience_required', 0]}, None]}},
+            'in': {'$cond': [{'$isArray': '$$first'}, {'$arrayElemAt': ['$$first', 0]}, '$$first']},
+        }}),
+        **{level: _to_double(f'$study_level_required.{level}') for level in FEATURE_COLUMNS[1:]},
+        'Employable': _to_double('$Employable'),
+    }},
+]
+
+def extract_feature_columns(collection, batch_size=5000):
+    """ Stream FEATURE_PIPELINE results into preallocated float64 NumPy columns. """
+    names = FEATURE_COLUMNS + ['Employable']
+    capacity = max(collection.estimated_document_count(), 1)
+    matrix = np.zeros((capacity, len(names)), dtype=np.float64)
+    count = 0
+    batch = []
+
+    def store(batch, count, matrix):
+        if count + len(batch) > len(matrix):
+            matrix = np.concatenate([matrix, np.zeros((max(len(matrix), len(batch)), len(names)))])
+        matrix[count:count + len(batch)] = batch
+        return count + len(batch), matrix
+
+    for doc in collection.aggregate(FEATURE_PIPELINE, batchSize=batch_size):
+        batch.append([doc.get(name, 0.0) for name in names])
+        if len(batch) == batch_size:
+            count, matrix = store(batch, count, matrix)
+            batch = []
+    if batch:
+        count, matrix = store(batch, count, matrix)
+
+    matrix = matrix[:count]
+    columns = {name: matrix[:, j] for j, name in enumerate(names)}
+    columns['Employable'] = columns['Employable'].astype(np.int64)
+    return columns
+
+
+def configure_threads(threads):
+    """ Pin TensorFlow's intra- and inter-op pools; 0 keeps TensorFlow's defaults. """
+    import tensorflow as tf
+    if not threads:
+        return
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    except RuntimeError:
+        # Only possible before TensorFlow initializes, e.g. not after warm-start loading in the same process
+        print(f"TensorFlow already initialized, keeping its thread pools (TRAIN_THREADS={threads} ignored).")
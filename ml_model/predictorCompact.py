@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import numpy as np
+from ml_model import predictorNumpy
+
+class EmploymentPredictor(predictorNumpy.EmploymentPredictor):
+    """ Compact variant of the exported MLP for low-memory replicas.
+
+    Built from the BatchNorm-folded float layers of ml_model.predictorNumpy:
+    each kernel is optionally magnitude-pruned, then quantized to int8 with one
+    float32 scale per output unit. The weights stay int8 in memory (4x smaller
+    than float32); the forward pass multiplies by the int8 kernel and rescales
+    the output columns. Input scaling and the predict* methods are inherited.
+    """
+    def load_model(self, path, mmap_mode=None):
+        """ Load a .npz written by save_model, or a directory written by save_folded (memory-mappable). """
+        if os.path.isdir(path):
+            with open(os.path.join(path, 'layers.json')) as f:
+                activations = json.load(f)
+            load = lambda name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+            self.scale = load('scale')
+            self.min_ = load('min_')
+            self.layers = [(load(f'layer_{n}_q'), load(f'layer_{n}_qscale'), load(f'layer_{n}_bias'), activation)
+                           for n, activation in enumerate(activations)]
+            return
+        state = np.load(path)
+        self.scale = state['scale'].astype(np.float64)
+        self.min_ = state['min_'].astype(np.float64)
+        self.layers = [(state[f'layer_{n}_q'], state[f'layer_{n}_qscale'], state[f'layer_{n}_bias'], activation)
+                       for n, activation in enumerate(json.loads(str(state['activations'])))]
+
+    def save_model(self, path):
+        """ Compressed .npz: pruned (zero) weights cost almost nothing on disk. """
+        arrays = {'scale': self.scale, 'min_': self.min_,
+                  'activations': np.array(json.dumps([activation for *_, activation in self.layers]))}
+        for n, (q, qscale, bias, _) in enumerate(self.layers):
+            arrays[f'layer_{n}_q'] = q
+            arrays[f'layer_{n}_qscale'] = qscale
+            arrays[f'layer_{n}_bias'] = bias
+        np.savez_compressed(path, **arrays)
+
+    def save_folded(self, path):
+        """ Write the int8 layers as plain .npy files that can be memory-mapped, as predictorNumpy does. """
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        np.save(os.path.join(tmp_path, 'scale.npy'), np.ascontiguousarray(self.scale, dtype=np.float64))
+        np.save(os.path.join(tmp_path, 'min_.npy'), np.ascontiguousarray(self.min_, dtype=np.float64))
+        for n, (q, qscale, bias, _) in enumerate(self.layers):
+            np.save(os.path.join(tmp_path, f'layer_{n}_q.npy'), np.ascontiguousarray(q))
+            np.save(os.path.join(tmp_path, f'layer_{n}_qscale.npy'), np.ascontiguousarray(qscale))
+            np.save(os.path.join(tmp_path, f'layer_{n}_bias.npy'), np.ascontiguousarray(bias))
+        with open(os.path.join(tmp_path, 'layers.json'), 'w') as f:
+            json.dump([activation for *_, activation in self.layers], f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(tmp_path, path)
+
+    def forward(self, features):
+        """ Run the network on an already scaled feature matrix, returning probabilities. """
+        x = np.asarray(features, dtype=np.float32)
+        for q, qscale, bias, activation in self.layers:
+            x = x @ q  # float32 result; the int8 kernel is widened inside the product
+            x *= qscale
+            x += bias
+            x = predictorNumpy.ACTIVATIONS[activation](x)
+        return x
+
+    @classmethod
+    def from_engine(cls, engine, sparsity=0.0):
+        """ Prune and quantize a loaded predictorNumpy engine. """
+        compact = cls()
+        compact.scale = np.asarray(engine.scale, dtype=np.float64)
+        compact.min_ = np.asarray(engine.min_, dtype=np.float64)
+        compact.layers = [quantize(prune(kernel, sparsity)) + (np.asarray(bias, dtype=np.float32), activation)
+                          for kernel, bias, activation in engine.layers]
+        return compact
+
+    def sparsity(self):
+        weights = sum(q.size for q, *_ in self.layers)
+        return sum(int(np.count_nonzero(q == 0)) for q, *_ in self.layers) / max(weights, 1)
+
+def prune(kernel, sparsity):
+    """ Zero the given fraction of a kernel's weights, smallest magnitudes first. """
+    kernel = np.array(kernel, dtype=np.float32)
+    if sparsity > 0:
+        cutoff = np.quantile(np.abs(kernel), sparsity)
+        kernel[np.abs(kernel) <= cutoff] = 0.0
+    return kernel
+
+def quantize(kernel):
+    """ Symmetric per-output-unit int8 quantization: kernel ~= q * qscale. """
+    qscale = np.abs(kernel).max(axis=0) / 127.0
+    qscale[qscale == 0] = 1.0
+    q = np.clip(np.round(kernel / qscale), -127, 127).astype(np.int8)
+    return q, qscale.astype(np.float32)
+
+def compare(reference, compact, X_test, y_test, threshold=0.5):
+    """ Accuracy of both engines on a scaled test split, and how far their probabilities drift. """
+    y_test = np.asarray(y_test).reshape(-1)
+    expected = reference.forward(X_test)[:, 0]
+    actual = compact.forward(X_test)[:, 0]
+    reference_accuracy = float(np.mean((expected > threshold) == y_test)) if len(y_test) else 0.0
+    compact_accuracy = float(np.mean((actual > threshold) == y_test)) if len(y_test) else 0.0
+    return {
+        'reference_accuracy': reference_accuracy,
+        'compact_accuracy': compact_accuracy,
+        'accuracy_drop': reference_accuracy - compact_accuracy,
+        'agreement': float(np.mean((expected > threshold) == (actual > threshold))) if len(y_test) else 1.0,
+        'max_abs_diff': float(np.max(np.abs(expected - actual))) if len(y_test) else 0.0,
+        'sparsity': compact.sparsity(),
+    }
@@ -8,6 +8,7 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
 import joblib
 from config import Config
+from ml_model.features import first_element, first_experience
 from sklearn.impute import SimpleImputer
 
 class EmploymentPredictor:
@@ -21,8 +22,15 @@ class EmploymentPredictor:
         self.imputer = SimpleImputer(strategy='mean')
 
     def extract_data(self):
-        # Fetch data from MongoDB collection
-        jobs_data = list(self.jobs_collection.find({}, projection={'_id': False}))
+        # Fetch only the fields the features are built from
+        jobs_data = list(self.jobs_collection.find({}, projection={
+            '_id': False,
+            'sector_activity': True,
+            'function': True,
+            'experience_required': True,
+            'study_level_required': True,
+            'Employable': True
+        }).batch_size(Config.EXTRACT_BATCH_SIZE))
         self.data = pd.DataFrame(jobs_data)
         
         # Preprocess the data immediately after extraction
@@ -40,15 +48,9 @@ class EmploymentPredictor:
             self.data['Job_Title'] = self.data['job_title'].apply(self.clean_text)
 
         # Extract the first relevant value from lists
-        self.data['Sector_Activity'] = self.data.get('sector_activity', pd.Series()).apply(
-            lambda x: x[0] if isinstance(x, list) and x else None
-        )
-        self.data['Function'] = self.data.get('function', pd.Series()).apply(
-            lambda x: x[0] if isinstance(x, list) and x else None
-        )
-        self.data['Experience_Required'] = self.data.get('experience_required', pd.Series()).apply(
-            lambda x: x[0][0] if isinstance(x, list) and x and isinstance(x[0], list) and x[0] else 0
-        )
+        self.data['Sector_Activity'] = first_element(self.data.get('sector_activity', pd.Series(dtype=object)))
+        self.data['Function'] = first_element(self.data.get('function', pd.Series(dtype=object)))
+        self.data['Experience_Required'] = first_experience(self.data.get('experience_required', pd.Series(dtype=object)))
         # Normalize Experience_Required to a 0-1 scale
         self.data['Experience_Required'] = self.min_max_scaler.fit_transform(self.data[['Experience_Required']])
 
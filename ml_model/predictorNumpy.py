@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import numpy as np
+from ml_model.features import FEATURE_COLUMNS
+
+class EmploymentPredictor:
+    """ TensorFlow-free inference for the MLP exported by ml_model.predictor.
+
+    The exported artifact holds the Dense weights, BatchNormalization statistics
+    and the MinMaxScaler state. BatchNormalization is folded into the following
+    Dense layer at load time and Dropout is dropped, so a forward pass is just a
+    few matrix products.
+    """
+    def __init__(self):
+        self.layers = []
+        self.scale = None
+        self.min_ = None
+        # Named decision thresholds of the loaded version (ml_model.operatingPoints), set by the caller
+        self.operating_points = {}
+
+    def load_model(self, path, mmap_mode=None):
+        """ Load an exported .npz, or a folded directory written by save_folded.
+
+        With a folded directory and mmap_mode='r' the weights are memory-mapped
+        read-only, so every worker process shares the same physical pages.
+        """
+        if os.path.isdir(path):
+            with open(os.path.join(path, 'layers.json')) as f:
+                activations = json.load(f)
+            load = lambda name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+            self.scale = load('scale')
+            self.min_ = load('min_')
+            self.layers = [(load(f'layer_{n}_kernel'), load(f'layer_{n}_bias'), activation)
+                           for n, activation in enumerate(activations)]
+            return
+        state = np.load(path)
+        self.scale = state['scale'].astype(np.float64)
+        self.min_ = state['min_'].astype(np.float64)
+        self.layers = fold_layers(state)
+
+    def save_folded(self, path):
+        """ Write the folded network as plain .npy files that can be memory-mapped. """
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        np.save(os.path.join(tmp_path, 'scale.npy'), np.ascontiguousarray(self.scale, dtype=np.float64))
+        np.save(os.path.join(tmp_path, 'min_.npy'), np.ascontiguousarray(self.min_, dtype=np.float64))
+        for n, (kernel, bias, _) in enumerate(self.layers):
+            np.save(os.path.join(tmp_path, f'layer_{n}_kernel.npy'), np.ascontiguousarray(kernel))
+            np.save(os.path.join(tmp_path, f'layer_{n}_bias.npy'), np.ascontiguousarray(bias))
+        with open(os.path.join(tmp_path, 'layers.json'), 'w') as f:
+            json.dump([activation for _, _, activation in self.layers], f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(tmp_path, path)
+
+    def forward(self, features):
+        """ Run the network on an already scaled feature matrix, returning probabilities. """
+        x = np.asarray(features, dtype=np.float32)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = ACTIVATIONS[activation](x)
+        return x
+
+    def features_matrix(self, records):
+        features = np.zeros((len(records), len(FEATURE_COLUMNS)), dtype=np.float64)
+        for row, record in zip(features, records):
+            for j, col in enumerate(FEATURE_COLUMNS):
+                row[j] = to_numeric(record[col])
+        features *= self.scale
+        features += self.min_
+        return features
+
+    def predict_proba(self, input_data):
+        return float(self.forward(self.features_matrix([input_data]))[0, 0])
+
+    def predict(self, input_data, threshold=0.5):
+        return int(self.predict_proba(input_data) > threshold)
+
+    def predict_proba_batch(self, records, chunk_size=1024):
+        """ Predict a stream of input dicts, yielding probabilities in input order. """
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield from self._proba_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._proba_chunk(chunk)
+
+    def predict_batch(self, records, chunk_size=1024, threshold=0.5):
+        """ Predict a stream of input dicts, yielding classes in input order. """
+        for probability in self.predict_proba_batch(records, chunk_size):
+            yield int(probability > threshold)
+
+    def _proba_chunk(self, chunk):
+        return self.forward(self.features_matrix(chunk))[:, 0].tolist()
+
+
+def fold_layers(state):
+    """ Turn the exported layer list into (kernel, bias, activation) triples.
+
+    A BatchNormalization layer computes x * s + t with s = gamma / sqrt(var + eps)
+    and t = beta - mean * s, which is absorbed by the next Dense layer as
+    kernel' = s[:, None] * kernel and bias' = t @ kernel + bias.
+    """
+    layers = []
+    pending = None
+    for n, kind in enumerate(state['layers']):
+        kind = str(kind)
+        if kind == 'batchnorm':
+            s = state[f'layer_{n}_gamma'] / np.sqrt(state[f'layer_{n}_moving_variance'] + state[f'layer_{n}_epsilon'])
+            t = state[f'layer_{n}_beta'] - state[f'layer_{n}_moving_mean'] * s
+            s, t = s.astype(np.float64), t.astype(np.float64)
+            pending = (s, t) if pending is None else (pending[0] * s, pending[1] * s + t)
+        elif kind.startswith('dense:'):
+            kernel = state[f'layer_{n}_kernel'].astype(np.float64)
+            bias = state[f'layer_{n}_bias'].astype(np.float64)
+            if pending is not None:
+                s, t = pending
+                bias = t @ kernel + bias
+                kernel = s[:, None] * kernel
+                pending = None
+            layers.append((kernel.astype(np.float32), bias.astype(np.float32), kind.split(':', 1)[1]))
+        else:
+            raise ValueError(f"Unsupported exported layer: {kind}")
+
+    if pending is not None:
+        # Trailing BatchNormalization with no Dense after it: keep it as a diagonal layer
+        s, t = pending
+        layers.append((np.diag(s).astype(np.float32), t.astype(np.float32), 'linear'))
+    return layers
+
+
+def to_numeric(value):
+    """ Scalar equivalent of pd.to_numeric(errors='coerce') followed by fillna(0). """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if value != value else value
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'sigmoid': lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),
+}
@@ -8,6 +8,7 @@ from xgboost import XGBClassifier
 from sklearn.metrics import accuracy_score
 import joblib
 from config import Config
+from ml_model.features import first_element, first_experience
 from sklearn.impute import SimpleImputer
 import os
 
@@ -26,14 +27,22 @@ class EmploymentPredictor:
             os.makedirs(directory)
 
     def extract_data(self):
-        # Fetch data from MongoDB collection
-        jobs_data = list(self.jobs_collection.find({}, projection={'_id': False}))
+        # Fetch only the fields the features are built from
+        jobs_data = list(self.jobs_collection.find({}, projection={
+            '_id': False,
+            'sector_activity': True,
+            'function': True,
+            'experience_required': True,
+            'study_level_required': True,
+            'Employable': True
+        }).batch_size(Config.EXTRACT_BATCH_SIZE))
         self.data = pd.DataFrame(jobs_data)  # Corrected variable name
         self.preprocess_data()
-        # Save the extracted data to CSV for debugging
-        self.ensure_directory('debugData')
-        self.data.to_csv('debugData/extracted_data.csv', index=False)
-        print("Data extracted and saved to 'debugData/extracted_data.csv'.")
+        if Config.DEBUG_DUMPS:
+            # Save the extracted data to CSV for debugging
+            self.ensure_directory('debugData')
+            self.data.to_csv('debugData/extracted_data.csv', index=False)
+            print("Data extracted and saved to 'debugData/extracted_data.csv'.")
 
     def clean_text(self, text):
         """ Clean text by removing extra spaces, newlines, and non-alphanumeric characters. """
@@ -47,9 +56,9 @@ class EmploymentPredictor:
             self.data['Job_Title'] = self.data['job_title'].apply(self.clean_text)
 
         # Extract and preprocess data for model features
-        self.data['Sector_Activity'] = self.data.get('sector_activity', pd.Series()).apply(lambda x: x[0] if isinstance(x, list) and x else None)
-        self.data['Function'] = self.data.get('function', pd.Series()).apply(lambda x: x[0] if isinstance(x, list) and x else None)
-        self.data['Experience_Required'] = self.data.get('experience_required', pd.Series()).apply(lambda x: x[0][0] if isinstance(x, list) and x and isinstance(x[0], list) and x[0] else 0)
+        self.data['Sector_Activity'] = first_element(self.data.get('sector_activity', pd.Series(dtype=object)))
+        self.data['Function'] = first_element(self.data.get('function', pd.Series(dtype=object)))
+        self.data['Experience_Required'] = first_experience(self.data.get('experience_required', pd.Series(dtype=object)))
         self.data['Experience_Required'] = self.min_max_scaler.fit_transform(self.data[['Experience_Required']])
         if 'study_level_required' in self.data.columns:
             education_df = pd.json_normalize(self.data['study_level_required'])
@@ -66,12 +75,13 @@ class EmploymentPredictor:
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         self.X_train = self.scaler.fit_transform(self.X_train)
         self.X_test = self.scaler.transform(self.X_test)
-        # Save the split data to CSV for debugging
-        self.ensure_directory('debugData')
-        pd.DataFrame(self.X_train, columns=features).to_csv('debugData/training_data.csv', index=False)
-        pd.DataFrame(self.y_train).to_json('debugData/training_labels.json')
-        pd.DataFrame(self.X_test, columns=features).to_csv('debugData/testing_data.csv', index=False)
-        pd.DataFrame(self.y_test).to_json('debugData/testing_labels.json')
+        if Config.DEBUG_DUMPS:
+            # Save the split data to CSV for debugging
+            self.ensure_directory('debugData')
+            pd.DataFrame(self.X_train, columns=features).to_csv('debugData/training_data.csv', index=False)
+            pd.DataFrame(self.y_train).to_json('debugData/training_labels.json')
+            pd.DataFrame(self.X_test, columns=features).to_csv('debugData/testing_data.csv', index=False)
+            pd.DataFrame(self.y_test).to_json('debugData/testing_labels.json')
 
     def train_model(self):
         self.model = XGBClassifier(objective='binary:logistic', learning_rate=0.1, n_estimators=100, max_depth=5, subsample=0.8)
@@ -0,0 +1,73 @@
+import json
+import time
+import numpy as np
+
+class TrainingLog:
+    """ Per-epoch wall time and validation metrics across one or more model.fit calls.
+
+    Also keeps the weights of the best validation epoch seen so far, so training
+    split into phases (one fit per batch size) can end on the overall best model.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.epochs = []
+        self.best_loss = np.inf
+        self.best_weights = None
+        self.batch_size = None
+        self._started = None
+
+    def callback(self, batch_size):
+        import tensorflow as tf
+        self.batch_size = batch_size
+        return tf.keras.callbacks.LambdaCallback(on_epoch_begin=self._epoch_begin, on_epoch_end=self._epoch_end)
+
+    def _epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def _epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        val_loss = float(logs.get('val_loss', np.nan))
+        self.epochs.append({
+            'seconds': time.perf_counter() - self._started,
+            'batch_size': self.batch_size,
+            'learning_rate': float(np.asarray(self.model.optimizer.learning_rate)),
+            'val_loss': val_loss,
+            'val_accuracy': float(logs.get('val_accuracy', np.nan)),
+        })
+        if val_loss < self.best_loss:
+            self.best_loss = val_loss
+            self.best_weights = self.model.get_weights()
+
+    def restore_best(self):
+        if self.best_weights is not None:
+            self.model.set_weights(self.best_weights)
+
+    def report(self, **extra):
+        """ Epoch count, mean time per epoch and time to the best validation epoch. """
+        if not self.epochs:
+            return {**extra, 'epochs': 0}
+        seconds = np.array([epoch['seconds'] for epoch in self.epochs])
+        best = int(np.nanargmin([epoch['val_loss'] for epoch in self.epochs]))
+        phases = {}
+        for epoch in self.epochs:
+            phases[epoch['batch_size']] = phases.get(epoch['batch_size'], 0) + 1
+        return {
+            **extra,
+            'epochs': len(self.epochs),
+            'seconds_total': float(seconds.sum()),
+            'seconds_per_epoch': float(seconds.mean()),
+            'best_epoch': best + 1,
+            'seconds_to_converge': float(seconds[:best + 1].sum()),
+            'val_loss': self.epochs[best]['val_loss'],
+            'val_accuracy': self.epochs[best]['val_accuracy'],
+            'epochs_per_batch_size': {str(size): count for size, count in phases.items()},
+        }
+
+    def save(self, path, **extra):
+        report = self.report(**extra)
+        with open(path, 'w') as f:
+            json.dump({**report, 'history': self.epochs}, f, indent=2)
+        print(f"Training: {report['epochs']} epochs, {report.get('seconds_per_epoch', 0):.3f}s/epoch, "
+              f"converged at epoch {report.get('best_epoch')} after {report.get('seconds_to_converge', 0):.1f}s "
+              f"(val_loss {report.get('val_loss', np.nan):.4f}, val_accuracy {report.get('val_accuracy', np.nan):.4f})")
+        return report
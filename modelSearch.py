@@ -0,0 +1,248 @@
+import concurrent.futures
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from config import Config
+from ml_model.features import FEATURE_COLUMNS
+
+# Model selection across the Keras MLP, XGBoost and logistic regression backends.
+# Every (candidate, fold) pair is a task in a process pool sized to the cores; the
+# feature matrix and labels live in shared memory that the workers attach to, so
+# only the task description is pickled. Produces a leaderboard (CV accuracy,
+# training time, model size, single-row and batch inference latency) and saves
+# the refitted winner under Config.MODEL_SEARCH_DIR.
+#
+#   python modelSearch.py                 # all installed backends
+#   python modelSearch.py lr xgboost      # a subset
+
+SEARCH_SPACE = {
+    'keras': {
+        'units': [(512, 256), (128, 64)],
+        'dropout': [0.2],
+        'learning_rate': [0.001, 0.0001],
+        'batch_size': [64, 256],
+        'epochs': [200],
+        'patience': [20],
+    },
+    'xgboost': {
+        'max_depth': [3, 5, 7],
+        'n_estimators': [100, 300],
+        'learning_rate': [0.1, 0.05],
+    },
+    'lr': {
+        'C': [0.1, 1.0, 10.0],
+    },
+}
+BACKEND_MODULES = {'keras': 'tensorflow', 'xgboost': 'xgboost', 'lr': 'sklearn'}
+LATENCY_CALLS = 200
+LATENCY_BATCH = 1024
+
+# Set in each worker by attach_dataset
+_X = None
+_y = None
+_segments = []
+
+def candidates(backends):
+    for backend in backends:
+        space = SEARCH_SPACE[backend]
+        for values in itertools.product(*space.values()):
+            yield backend, dict(zip(space, values))
+
+def share_array(array):
+    """ Copy an array into a new shared memory block; returns the block and its (name, shape, dtype). """
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return segment, (segment.name, array.shape, array.dtype.str)
+
+def attach_dataset(X_spec, y_spec):
+    """ Pool initializer: map the parent's shared arrays and keep each worker single-threaded. """
+    global _X, _y
+    for var in ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS']:
+        os.environ[var] = '1'
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    arrays = []
+    for name, shape, dtype in (X_spec, y_spec):
+        segment = shared_memory.SharedMemory(name=name)
+        _segments.append(segment)  # keep the mapping alive for the worker's lifetime
+        arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf))
+    _X, _y = arrays
+
+def fit(backend, params, X, y):
+    """ Fit one backend on (X, y); returns (scaler, model). Features are min-max scaled as in predictor.py. """
+    from sklearn.preprocessing import MinMaxScaler
+    scaler = MinMaxScaler().fit(X)
+    X = scaler.transform(X).astype(np.float32)
+    if backend == 'keras':
+        import tensorflow as tf
+        from ml_model.predictor import EmploymentPredictor
+        predictor = EmploymentPredictor()
+        predictor.build_model(units=params['units'], dropout=params['dropout'],
+                              learning_rate=params['learning_rate'], input_shape=X.shape[1])
+        # Early stopping watches a slice of the training fold, never the scored fold
+        predictor.model.fit(X, y, epochs=params['epochs'], batch_size=params['batch_size'], validation_split=0.1, verbose=0,
+                            callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=params['patience'], restore_best_weights=True)])
+        return scaler, predictor.model
+    if backend == 'xgboost':
+        from xgboost import XGBClassifier
+        model = XGBClassifier(objective='binary:logistic', subsample=0.8, n_jobs=1, **params)
+    else:
+        from sklearn.linear_model import LogisticRegression
+        model = LogisticRegression(max_iter=1000, **params)
+    return scaler, model.fit(X, y)
+
+def predict_proba(backend, scaler, model, X):
+    X = scaler.transform(X).astype(np.float32)
+    if backend == 'keras':
+        return model(X, training=False).numpy()[:, 0]
+    return model.predict_proba(X)[:, 1]
+
+def model_size(backend, scaler, model):
+    """ Bytes of the artifact as it would be saved. """
+    if backend == 'keras':
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save(os.path.join(tmp, 'model.h5'))
+            return os.path.getsize(os.path.join(tmp, 'model.h5')) + scaler.scale_.nbytes + scaler.min_.nbytes
+    return len(pickle.dumps((scaler, model)))
+
+def latency_ms(fn, calls):
+    fn()
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+def evaluate(backend, params, fold):
+    """ Pool task: train on every other fold, score this one. Fold 0 also measures size and latency. """
+    from sklearn.model_selection import StratifiedKFold
+    # Same seed in every worker, so all tasks agree on the split without shipping indices
+    folds = StratifiedKFold(n_splits=Config.SEARCH_FOLDS, shuffle=True, random_state=42)
+    train_idx, test_idx = list(folds.split(_X, _y))[fold]
+
+    start = time.perf_counter()
+    scaler, model = fit(backend, params, _X[train_idx], _y[train_idx])
+    train_seconds = time.perf_counter() - start
+
+    X_test, y_test = _X[test_idx], _y[test_idx]
+    accuracy = float(np.mean((predict_proba(backend, scaler, model, X_test) > 0.5) == y_test))
+    result = {'backend': backend, 'params': params, 'fold': fold, 'accuracy': accuracy, 'train_seconds': train_seconds}
+    if fold == 0:
+        row, batch = X_test[:1], X_test[np.arange(LATENCY_BATCH) % len(X_test)]
+        result['size_bytes'] = model_size(backend, scaler, model)
+        result['latency_ms'] = latency_ms(lambda: predict_proba(backend, scaler, model, row), LATENCY_CALLS)
+        result['batch_latency_ms'] = latency_ms(lambda: predict_proba(backend, scaler, model, batch), LATENCY_CALLS // 10)
+    return result
+
+def refit_and_save(backend, params, path):
+    """ Pool task: fit the winner on all rows and write its artifact directory atomically. """
+    scaler, model = fit(backend, params, _X, _y)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    if backend == 'keras':
+        # Same layout as ml_model/trained, loadable by predictor.EmploymentPredictor.load_model
+        model.save(os.path.join(tmp_path, 'model.h5'))
+        np.savez(os.path.join(tmp_path, 'scaler.npz'), scale=scaler.scale_, min_=scaler.min_)
+    else:
+        import joblib
+        joblib.dump({'scaler': scaler, 'model': model}, os.path.join(tmp_path, 'model.joblib'))
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp_path, path)
+    return path
+
+def leaderboard(results):
+    """ One row per candidate, best mean CV accuracy first (ties go to the faster model). """
+    rows = {}
+    for result in results:
+        key = (result['backend'], json.dumps(result['params'], sort_keys=True))
+        row = rows.setdefault(key, {'backend': result['backend'], 'params': result['params'], 'accuracies': [], 'train_seconds': []})
+        row['accuracies'].append(result['accuracy'])
+        row['train_seconds'].append(result['train_seconds'])
+        for field in ('size_bytes', 'latency_ms', 'batch_latency_ms'):
+            if field in result:
+                row[field] = result[field]
+    board = []
+    for row in rows.values():
+        accuracies, train_seconds = row.pop('accuracies'), row.pop('train_seconds')
+        row['accuracy'] = float(np.mean(accuracies))
+        row['accuracy_std'] = float(np.std(accuracies))
+        row['train_seconds'] = float(np.mean(train_seconds))
+        for field in ('size_bytes', 'latency_ms', 'batch_latency_ms'):
+            row.setdefault(field, float('nan'))  # fold 0 failed
+        board.append(row)
+    return sorted(board, key=lambda row: (-row['accuracy'], row['latency_ms']))
+
+def load_dataset():
+    from ml_model.predictor import EmploymentPredictor
+    predictor = EmploymentPredictor()
+    columns = predictor.load_feature_columns()
+    X = np.column_stack([np.asarray(columns[col], dtype=np.float32) for col in FEATURE_COLUMNS])
+    y = np.asarray(columns['Employable'], dtype=np.int8)
+    return X, y, predictor.snapshot_id
+
+def run(backends):
+    X, y, snapshot_id = load_dataset()
+    print(f"{len(y)} rows from snapshot {snapshot_id}, {Config.SEARCH_FOLDS}-fold CV, {Config.SEARCH_WORKERS} workers.")
+    segments = []
+    try:
+        X_segment, X_spec = share_array(X)
+        segments.append(X_segment)
+        y_segment, y_spec = share_array(y)
+        segments.append(y_segment)
+
+        # spawn rather than fork: TensorFlow does not survive being forked
+        context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=Config.SEARCH_WORKERS, mp_context=context,
+                                                    initializer=attach_dataset, initargs=(X_spec, y_spec)) as pool:
+            tasks = [pool.submit(evaluate, backend, params, fold)
+                     for backend, params in candidates(backends) for fold in range(Config.SEARCH_FOLDS)]
+            results = []
+            for task in concurrent.futures.as_completed(tasks):
+                try:
+                    results.append(task.result())
+                except Exception as e:
+                    print(f"Search task failed: {e}")
+            board = leaderboard(results)
+            if not board:
+                print("No candidate finished.")
+                return None
+            winner = board[0]
+            path = pool.submit(refit_and_save, winner['backend'], winner['params'],
+                               os.path.join(Config.MODEL_SEARCH_DIR, 'winner')).result()
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    report = {'snapshot_id': snapshot_id, 'rows': len(y), 'folds': Config.SEARCH_FOLDS,
+              'winner': {**winner, 'path': path}, 'leaderboard': board}
+    with open(os.path.join(Config.MODEL_SEARCH_DIR, 'leaderboard.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'backend':>8} {'accuracy':>15} {'train s':>8} {'size KB':>9} {'1-row ms':>9} {f'{LATENCY_BATCH}-row ms':>12}  params")
+    for row in board:
+        print(f"{row['backend']:>8} {row['accuracy']:8.4f} ±{row['accuracy_std']:.4f} {row['train_seconds']:8.2f} "
+              f"{row['size_bytes'] / 1024:9.1f} {row['latency_ms']:9.3f} {row['batch_latency_ms']:12.3f}  {row['params']}")
+    print(f"Winner: {winner['backend']} {winner['params']} saved to {path}")
+    return report
+
+if __name__ == '__main__':
+    backends = sys.argv[1:] or list(SEARCH_SPACE)
+    unknown = [backend for backend in backends if backend not in SEARCH_SPACE]
+    if unknown:
+        sys.exit(f"Unknown backends {unknown}; choose from {list(SEARCH_SPACE)}")
+    installed = [backend for backend in backends if importlib.util.find_spec(BACKEND_MODULES[backend])]
+    for backend in sorted(set(backends) - set(installed)):
+        print(f"Skipping {backend}: {BACKEND_MODULES[backend]} is not installed.")
+    os.makedirs(Config.MODEL_SEARCH_DIR, exist_ok=True)
+    run(installed)
@@ -0,0 +1,106 @@
+import datetime
+import os
+import socket
+import threading
+import uuid
+from pymongo.errors import DuplicateKeyError
+
+COUNTERS_ID = 'dashboard'
+# Held by the one API process that runs reconcile(); see start_reconciler
+LEASE_ID = 'reconciler'
+
+class Counters:
+    """ Precomputed dashboard totals kept in a single document of the counters collection.
+
+    Writers bump the totals with $inc as they insert predictions or jobs, so
+    reading them is one lookup by _id regardless of collection size.
+    reconcile() recomputes the true counts to correct any drift (for example
+    documents written by tools that bypass these hooks).
+    """
+    def __init__(self, collection):
+        self.collection = collection
+
+    def record_predictions(self, documents):
+        employable = sum(1 for doc in documents if doc.get('prediction') == 1)
+        non_employable = sum(1 for doc in documents if doc.get('prediction') == 0)
+        self.collection.update_one({'_id': COUNTERS_ID}, {'$inc': {
+            'stats_count': len(documents),
+            'employable_count': employable,
+            'non_employable_count': non_employable,
+        }}, upsert=True)
+
+    def record_jobs(self, count):
+        if count:
+            self.collection.update_one({'_id': COUNTERS_ID}, {'$inc': {'jobs_count': count}}, upsert=True)
+
+    def get(self):
+        doc = self.collection.find_one({'_id': COUNTERS_ID}, {'_id': 0}) or {}
+        return {
+            'jobs_count': doc.get('jobs_count', 0),
+            'stats_count': doc.get('stats_count', 0),
+            'employable_count': doc.get('employable_count', 0),
+            'non_employable_count': doc.get('non_employable_count', 0),
+        }
+
+    def exists(self):
+        return self.collection.count_documents({'_id': COUNTERS_ID}, limit=1) > 0
+
+    def reconcile(self, stats_collection, jobs_collection):
+        """ Add the difference between the true counts and the stored totals.
+
+        The correction is applied with $inc, so increments recorded while the
+        counts run are kept rather than overwritten as a $set would.
+        """
+        queries = {
+            'jobs_count': (jobs_collection, {}),
+            'stats_count': (stats_collection, {}),
+            'employable_count': (stats_collection, {'prediction': 1}),
+            'non_employable_count': (stats_collection, {'prediction': 0}),
+        }
+        counts = {}
+        for field, (collection, query) in queries.items():
+            counts[field] = collection.count_documents(query)
+            # Read right after the count, so only increments landing in between can be misattributed
+            stored = (self.collection.find_one({'_id': COUNTERS_ID}, {field: 1}) or {}).get(field, 0)
+            if counts[field] != stored:
+                self.collection.update_one({'_id': COUNTERS_ID}, {'$inc': {field: counts[field] - stored}}, upsert=True)
+        return counts
+
+    def acquire_lease(self, holder, seconds):
+        """ Take or renew the reconciler lease; True if `holder` now owns it for `seconds`. """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            self.collection.update_one(
+                {'_id': LEASE_ID, '$or': [{'holder': holder}, {'expires_at': {'$lt': now}}]},
+                {'$set': {'holder': holder, 'expires_at': now + datetime.timedelta(seconds=seconds)}},
+                upsert=True)
+        except DuplicateKeyError:
+            return False  # held by another live process
+        return True
+
+    def start_reconciler(self, stats_collection, jobs_collection, interval):
+        """ Reconcile now if the counters were never initialised, then every `interval` seconds.
+
+        Every API process starts one, but only the holder of the lease document
+        runs the counts; it renews the lease each interval, and another process
+        takes over once a holder stops renewing.
+        """
+        holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+
+        def reconcile(initialise):
+            try:
+                if initialise and self.exists():
+                    return
+                if self.acquire_lease(holder, interval * 1.5):
+                    self.reconcile(stats_collection, jobs_collection)
+            except Exception as e:
+                print("Failed to reconcile counters:", e)
+
+        def run():
+            reconcile(initialise=True)
+            while not stop.wait(interval):
+                reconcile(initialise=False)
+
+        stop = threading.Event()
+        threading.Thread(target=run, name='counters-reconciler', daemon=True).start()
+        return stop
@@ -0,0 +1,132 @@
+import datetime
+import sys
+import threading
+from pymongo import MongoClient, ASCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from config import Config
+
+GRANULARITIES = ('hour', 'day', 'week')
+EDUCATION_LEVELS = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
+# Marker written by the process that backfills an empty rollups collection (not a bucket)
+BACKFILL_ID = 'backfill'
+
+def bucket_start(timestamp, granularity):
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - datetime.timedelta(days=day.weekday())  # weeks start on Monday
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+def education_level(doc):
+    """ Highest education flag set on a stats document, or 'None'. """
+    for level in reversed(EDUCATION_LEVELS):
+        if doc.get(level) == 1:
+            return level
+    return 'None'
+
+class Rollups:
+    """ Prediction counts per hour/day/week bucket, updated as stats are written.
+
+    One document per (granularity, bucket) holds the total, the employable /
+    non-employable split and the same split per highest education level, so
+    the histogram endpoint reads a handful of small documents instead of
+    aggregating db.stats.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+
+    def ensure_indexes(self):
+        self.collection.create_index([('granularity', ASCENDING), ('bucket', ASCENDING)])
+
+    def record_predictions(self, documents):
+        increments = {}
+        for doc in documents:
+            outcome = 'employable' if doc.get('prediction') == 1 else 'non_employable'
+            level = education_level(doc)
+            for granularity in GRANULARITIES:
+                key = (granularity, bucket_start(doc['timestamp'], granularity))
+                inc = increments.setdefault(key, {})
+                for field in ('total', outcome, f'education.{level}.total', f'education.{level}.{outcome}'):
+                    inc[field] = inc.get(field, 0) + 1
+
+        if increments:
+            self.collection.bulk_write([
+                UpdateOne({'_id': f'{granularity}:{bucket.isoformat()}'},
+                          {'$inc': inc, '$setOnInsert': {'granularity': granularity, 'bucket': bucket}},
+                          upsert=True)
+                for (granularity, bucket), inc in increments.items()
+            ], ordered=False)
+
+    def histogram(self, granularity, start=None, end=None):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        query = {'granularity': granularity}
+        if start or end:
+            query['bucket'] = {}
+            if start:
+                query['bucket']['$gte'] = bucket_start(start, granularity)
+            if end:
+                query['bucket']['$lt'] = end
+        buckets = []
+        for doc in self.collection.find(query, {'_id': 0, 'granularity': 0}).sort('bucket', ASCENDING):
+            buckets.append({
+                'bucket': doc['bucket'].isoformat(),
+                'total': doc.get('total', 0),
+                'employable': doc.get('employable', 0),
+                'non_employable': doc.get('non_employable', 0),
+                'education': doc.get('education', {}),
+            })
+        return buckets
+
+    def exists(self):
+        return self.collection.count_documents({}, limit=1) > 0
+
+    def rebuild(self, stats_collection, batch_size=1000):
+        """ Recompute every bucket from db.stats (repair). Predictions recorded while it runs may be counted twice. """
+        self.collection.delete_many({'_id': {'$ne': BACKFILL_ID}})
+        self.record_from(stats_collection, {'timestamp': {'$exists': True}}, batch_size)
+
+    def record_from(self, stats_collection, query, batch_size=1000):
+        batch = []
+        for doc in stats_collection.find(query, {'_id': 0}).batch_size(batch_size):
+            batch.append(doc)
+            if len(batch) == batch_size:
+                self.record_predictions(batch)
+                batch = []
+        self.record_predictions(batch)
+
+    def start_backfill(self, stats_collection):
+        """ Build the buckets from the predictions already in db.stats if the rollups were never initialised. """
+        def run():
+            try:
+                if self.exists():
+                    return
+                started = datetime.datetime.now()
+                # Only one API process wins the insert; the others see the marker and skip
+                self.collection.insert_one({'_id': BACKFILL_ID, 'started_at': started})
+            except DuplicateKeyError:
+                return
+            except Exception as e:
+                print("Failed to initialise prediction rollups:", e)
+                return
+            try:
+                # Predictions from now on are recorded by the stats writer listeners
+                self.record_from(stats_collection, {'timestamp': {'$lt': started}})
+                self.collection.update_one({'_id': BACKFILL_ID}, {'$set': {'finished_at': datetime.datetime.now()}})
+            except Exception as e:
+                print("Failed to backfill prediction rollups (run python predictionRollups.py --rebuild):", e)
+
+        thread = threading.Thread(target=run, name='rollups-backfill', daemon=True)
+        thread.start()
+        return thread
+
+if __name__ == '__main__':
+    # python predictionRollups.py --rebuild   recompute every bucket from db.stats (best with the API stopped)
+    if '--rebuild' not in sys.argv:
+        sys.exit("Usage: python predictionRollups.py --rebuild")
+    db = MongoClient(Config.MONGO_URI)[Config.DATABASE_NAME]
+    Rollups(db[Config.ROLLUPS_COLLECTION]).rebuild(db.stats)
+    print("Prediction rollups rebuilt.")
@@ -0,0 +1,52 @@
+import os
+from gunicorn.app.base import BaseApplication
+from ml_model import predictorCompact
+from ml_model.predictorNumpy import EmploymentPredictor
+from ml_model.modelRegistry import get_registry, is_version, NUMPY_MODEL, MMAP_MODEL, COMPACT_MODEL, COMPACT_MMAP_MODEL
+from config import Config
+
+# Production entry point: N worker processes serving app.py. Each worker
+# memory-maps the same folded model directory, so the weights are held once
+# in the page cache instead of once per worker.
+
+class APIServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+def ensure_mmap_model():
+    """ Build the memory-mappable model directories of the current version from its exported .npz files if needed. """
+    _, path = get_registry().resolve()
+    if path is None or not is_version(path):
+        return
+    mmap_path, numpy_path = os.path.join(path, MMAP_MODEL), os.path.join(path, NUMPY_MODEL)
+    if not os.path.isdir(mmap_path) and os.path.exists(numpy_path):
+        engine = EmploymentPredictor()
+        engine.load_model(numpy_path)
+        engine.save_folded(mmap_path)
+        print("Folded model written to", mmap_path)
+    compact_mmap_path, compact_path = os.path.join(path, COMPACT_MMAP_MODEL), os.path.join(path, COMPACT_MODEL)
+    if Config.SERVE_COMPACT and not os.path.isdir(compact_mmap_path) and os.path.exists(compact_path):
+        compact = predictorCompact.EmploymentPredictor()
+        compact.load_model(compact_path)
+        compact.save_folded(compact_mmap_path)
+        print("Compact model written to", compact_mmap_path)
+
+if __name__ == '__main__':
+    ensure_mmap_model()
+    APIServer({
+        'bind': Config.SERVE_BIND,
+        'workers': Config.SERVE_WORKERS,
+        # Threads let concurrent /predict calls in one worker share a micro-batch
+        'threads': Config.SERVE_THREADS,
+        # Workers import the app themselves; sharing comes from the mmap, not fork
+        'preload_app': False,
+    }).run()
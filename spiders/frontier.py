@@ -0,0 +1,61 @@
+import datetime
+import hashlib
+
+class CrawlFrontier:
+    """ Per-URL crawl state: ETag / Last-Modified validators, a hash of the
+    listing markup and when the page was last seen, persisted in Mongo so the
+    next run can send conditional requests and skip unchanged pages.
+
+    A parsed page is only staged; commit() writes it once the pipeline has
+    stored the page's items, so a crawl that dies or fails to flush re-fetches
+    the page next time instead of treating it as already seen.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+        self.entries = {}
+        self.pending = {}
+
+    def load(self, urls):
+        self.entries = {doc['url']: doc for doc in self.collection.find({'url': {'$in': list(urls)}}, {'_id': 0})}
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, content_hash):
+        return self.entries.get(url, {}).get('content_hash') == content_hash
+
+    def touch(self, url):
+        self.collection.update_one({'url': url}, {'$set': {'last_seen': datetime.datetime.now()}}, upsert=True)
+
+    def stage(self, url, response, content_hash, new_jobs):
+        self.pending[url] = {
+            'url': url,
+            'etag': header(response, 'ETag'),
+            'last_modified': header(response, 'Last-Modified'),
+            'content_hash': content_hash,
+            'last_seen': datetime.datetime.now(),
+            'last_new_jobs': new_jobs,
+        }
+
+    def commit(self):
+        """ Persist the staged pages; called after their items are written. """
+        for url, entry in self.pending.items():
+            self.collection.update_one({'url': url}, {'$set': entry}, upsert=True)
+            self.entries[url] = entry
+        self.pending = {}
+
+
+def header(response, name):
+    value = response.headers.get(name)
+    return value.decode('latin-1') if value else None
+
+def content_hash(response):
+    """ Hash of the listing block only, so ads or session tokens elsewhere on the page do not count as changes. """
+    listing = response.xpath('//ul[@id="post-data"]').get() or ''
+    return hashlib.sha1(listing.encode('utf-8')).hexdigest()
@@ -1,48 +1,97 @@
 import scrapy
 from spiders.items import JobItem
-from pymongo import MongoClient
+from spiders.pipelines import get_client
+from spiders.frontier import CrawlFrontier, content_hash
 from config import Config
+from ml_model.features import education_flags, experience_lists
 import random
-import re
 
 class JobSpider(scrapy.Spider):
     name = "job_spider"
 
-    def __init__(self, url=None, *args, **kwargs):
+    # Label at the start of a listing's <li> row -> item field it fills
+    LISTING_FIELDS = [
+        ("Secteur d'activité", 'sector_activity'),
+        ("Fonction", 'function'),
+        ("Expérience requise", 'experience_required'),
+        ("Niveau d'étude demandé", 'study_level_required'),
+        ("Type de contrat proposé", 'contract_type_offered'),
+    ]
+
+    def __init__(self, url=None, urls=None, incremental=False, *args, **kwargs):
         super(JobSpider, self).__init__(*args, **kwargs)
-        self.start_urls = [url] if url else self.load_start_urls()
-        self.client = MongoClient(Config.MONGO_URI)
+        # Items are persisted by spiders.pipelines.MongoPipeline; the spider only reads
+        self.client = get_client()
         self.db = self.client[Config.DATABASE_NAME]
         self.jobs_collection = self.db[Config.JOBS_COLLECTION]
         self.functions_collection = self.db[Config.functions_collection]
         self.sectors_collection = self.db[Config.sectors_collection]
-        self.new_jobs_count = 0
+        self.start_urls = urls or ([url] if url else self.load_start_urls())
+        self.incremental = incremental in (True, 'True', 'true', '1')
+        if self.incremental:
+            self.frontier = CrawlFrontier(self.db[Config.FRONTIER_COLLECTION])
+            self.frontier.load(self.start_urls)
 
     def load_start_urls(self):
         collection = self.db[Config.URLS_COLLECTION]
         urls = list(collection.find({}, {'_id': 0, 'url': 1}))
         return [url['url'] for url in urls]
 
-    def get_numeric_value(self, collection, value):
-        doc = collection.find_one({'name': value})
-        if doc:
-            return doc['numeric_value']
-        else:
-            numeric_value = collection.count_documents({}) + 1
-            collection.insert_one({'name': value, 'numeric_value': numeric_value})
-            return numeric_value
+    def start_requests(self):
+        if not self.incremental:
+            yield from super(JobSpider, self).start_requests()
+        elif self.start_urls:
+            yield self.page_request(0)
+
+    def page_request(self, index):
+        """ Conditional request for the index-th listing page; pages are crawled in order. """
+        url = self.start_urls[index]
+        return scrapy.Request(url, headers=self.frontier.conditional_headers(url), dont_filter=True,
+                              callback=self.parse_incremental, cb_kwargs={'index': index},
+                              meta={'handle_httpstatus_list': [304]})
+
+    def parse_incremental(self, response, index):
+        url = self.start_urls[index]
+        if response.status == 304:
+            self.frontier.touch(url)
+            self.logger.info(f"{url} not modified, stopping pagination")
+            return
+        page_hash = content_hash(response)
+        if self.frontier.is_unchanged(url, page_hash):
+            self.frontier.touch(url)
+            self.logger.info(f"{url} unchanged, stopping pagination")
+            return
+
+        items = list(self.parse(response))
+        yield from items
+        new_jobs = sum(1 for item in items if item['Employable'] == 1)
+        # Written by MongoPipeline.close_spider once these items are stored
+        self.frontier.stage(url, response, page_hash, new_jobs)
+
+        # Listings are newest first: a page with nothing new means the rest is already stored
+        if new_jobs and index + 1 < len(self.start_urls):
+            yield self.page_request(index + 1)
+        elif not new_jobs:
+            self.logger.info(f"No new jobs on {url}, stopping pagination")
 
     def parse(self, response):
-        for job in response.xpath('//ul[@id="post-data"]/li'):
-            job_detail_url = response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get())
-            if not self.jobs_collection.find_one({'job_detail_url': job_detail_url}):
-                item = self.extract_job_item(job, response, job_detail_url)
-                self.jobs_collection.insert_one(dict(item))
-                self.new_jobs_count += 1
-                yield item
-                non_employable_item = self.create_non_employable_version(item)
-                self.jobs_collection.insert_one(non_employable_item)
-                yield non_employable_item
+        jobs = response.xpath('//ul[@id="post-data"]/li')
+        urls = [response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get()) for job in jobs]
+
+        # One round trip to find which listings on this page are already stored
+        known = {doc['job_detail_url'] for doc in self.jobs_collection.find(
+            {'job_detail_url': {'$in': urls}}, {'_id': 0, 'job_detail_url': 1})}
+
+        items = []
+        for job, job_detail_url in zip(jobs, urls):
+            if job_detail_url in known:
+                continue
+            known.add(job_detail_url)
+            item = self.extract_job_item(job, response, job_detail_url)
+            items.append(item)
+            items.append(self.create_non_employable_version(item))
+
+        yield from items
 
     def extract_job_item(self, job, response, job_detail_url):
         item = JobItem()
@@ -58,39 +107,85 @@ class JobSpider(scrapy.Spider):
         item['post_offered'] = job.xpath('.//em[contains(text(), "Postes proposés:")]/span/text()').get()
         item['sector_activity'] = [s.strip() for s in job.xpath('.//li[contains(text(), "Secteur d\'activité")]/a/text()').getall()]
         item['function'] = [s.strip() for s in job.xpath('.//li[contains(text(), "Fonction")]/a/text()').getall()]
-        item['experience_required'] = [self.extract_minimum_experience(s.strip()) for s in job.xpath('.//li[contains(text(), "Expérience requise")]/a/text()').getall()]
-        item['study_level_required'] = self.extract_education(job.xpath('.//li[contains(text(), "Niveau d\'étude demandé")]/a/text()').get().strip())
+        item['experience_required'] = self.extract_minimum_experience([s.strip() for s in job.xpath('.//li[contains(text(), "Expérience requise")]/a/text()').getall()])
+        item['study_level_required'] = education_flags(job.xpath('.//li[contains(text(), "Niveau d\'étude demandé")]/a/text()').get().strip())
         item['contract_type_offered'] = job.xpath('.//li[contains(text(), "Type de contrat proposé")]/a/text()').get().strip()
         item['Employable'] = 1
         return item
 
-    def extract_minimum_experience(self, exp_string):
-        # Extract the numeric value from the experience string
-        matches = re.findall(r'\d+', exp_string)
-        return [int(num) for num in matches] if matches else [0]
-
-    def extract_education(text):
-        """ Map educational levels to structured format. """
-        levels = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
-        values = [0] * len(levels)
-        if 'Bac' in text and 'Bac +' not in text:
-            values[0] = 1 
-        if 'Bac +2' in text:
-            values[0:2] = [1, 1] 
-        if 'Bac +3' in text:
-            values[0:3] = [1, 1, 1]
-        if 'Bac +4' in text:
-            values[0:4] = [1, 1, 1, 1] 
-        if 'Bac +5' in text or 'Bac +5 et plus' in text:
-            values[0:5] = [1, 1, 1, 1, 1] 
-        if 'Doctorat' in text or 'Doctorate' in text:
-            values[:] = [1, 1, 1, 1, 1, 1]  
-
-        return dict(zip(levels, values))
+    def extract_job_item_single_pass(self, job, response, job_detail_url):
+        """ Same item as extract_job_item, but the listing's lxml tree is walked once and
+        each element is dispatched on its tag, instead of one XPath query per field.
+
+        Only checked against the hand-written pages in debugData/fixtures; parse keeps
+        using extract_job_item until it has been validated on saved rekrute pages.
+        """
+        first = {}
+        date_texts, date_spans = [], []
+        values = {field: [] for _, field in self.LISTING_FIELDS}
+        listing = job.root
+        for element in listing.iter():
+            tag = element.tag
+            if tag == 'a':
+                if element.getparent().tag == 'h2':
+                    if element.get('class') == 'titreJob':
+                        first.setdefault('title', next(iter(text_nodes(element)), None))
+                    if 'emploi' in element.get('href', ''):
+                        first.setdefault('location', next(iter(text_nodes(element)), None))
+                if element.get('class') == 'photo':
+                    first.setdefault('company_link', element.get('href'))
+            elif tag == 'span':
+                parent = element.getparent()
+                if parent.tag == 'div' and parent.get('class') == 'info':
+                    first.setdefault('company_name', next(iter(text_nodes(element)), None))
+            elif tag == 'em':
+                if element.get('class') == 'date':
+                    date_texts.extend(text_nodes(element))
+                    date_spans.extend(t for span in element if span.tag == 'span' for t in text_nodes(span))
+                # contains(text(), ...) in XPath tests the first text node only
+                label = next(iter(text_nodes(element)), '')
+                if 'Postes proposés:' in label and 'post_offered' not in first:
+                    posts = [t for span in element if span.tag == 'span' for t in text_nodes(span)]
+                    if posts:
+                        first['post_offered'] = posts[0]
+            elif tag == 'li' and element is not listing:
+                label = next(iter(text_nodes(element)), None)
+                if not label:
+                    continue
+                links = None
+                for text, field in self.LISTING_FIELDS:
+                    if text in label:
+                        if links is None:
+                            links = [t for a in element if a.tag == 'a' for t in text_nodes(a)]
+                        values[field].extend(links)
+
+        item = JobItem()
+        item['job_title'] = first.get('title').strip()
+        item['job_detail_url'] = job_detail_url
+        item['job_listed'] = date_texts[1].strip()
+        item['company_name'] = first.get('company_name').strip()
+        item['company_link'] = response.urljoin(first.get('company_link'))
+        item['company_location'] = first.get('location').split('|')[-1].strip()
+        item['publication_start_date'] = date_spans[0].strip()
+        item['publication_end_date'] = date_spans[1].strip()
+        item['post_offered'] = first.get('post_offered')
+        item['sector_activity'] = [s.strip() for s in values['sector_activity']]
+        item['function'] = [s.strip() for s in values['function']]
+        item['experience_required'] = self.extract_minimum_experience([s.strip() for s in values['experience_required']])
+        item['study_level_required'] = education_flags(next(iter(values['study_level_required']), None).strip())
+        item['contract_type_offered'] = next(iter(values['contract_type_offered']), None).strip()
+        item['Employable'] = 1
+        return item
+
+    def extract_minimum_experience(self, exp_strings):
+        # Numbers in each experience string ('De 3 à 5 ans' -> [3, 5]), [0] when there are none
+        return experience_lists(exp_strings)
 
     def create_non_employable_version(self, item):
         non_item = dict(item)
         non_item['Employable'] = 0
+        # Copy so downgrading below does not also change the employable item
+        non_item['study_level_required'] = dict(item['study_level_required'])
 
         # Handle experience being a list of integers
         if item['experience_required']:
@@ -109,8 +204,16 @@ class JobSpider(scrapy.Spider):
         return non_item
 
     def close(self, reason):
-        self.client.close()
+        # The shared client stays open for the other spiders in this process
+        self.new_jobs_count = self.crawler.stats.get_value('mongo/new_jobs', 0)
         if self.new_jobs_count == 0:
             self.logger.info("No new jobs were scraped.")
         else:
             self.logger.info(f"Scraped {self.new_jobs_count} new jobs.")
+
+
+def text_nodes(element):
+    """ lxml equivalent of the XPath text() children of an element. """
+    nodes = [element.text] if element.text is not None else []
+    nodes.extend(child.tail for child in element if child.tail is not None)
+    return nodes
@@ -1,48 +1,49 @@
 import scrapy
 from spiders.items import JobItem
-from pymongo import MongoClient
+from spiders.pipelines import get_client
+from spiders.valueEncoder import get_encoder
 from config import Config
+from ml_model.features import education_flags, experience_lists
 import random
-import re
 
 class JobSpider(scrapy.Spider):
     name = "job_spider"
 
     def __init__(self, url=None, *args, **kwargs):
         super(JobSpider, self).__init__(*args, **kwargs)
-        self.start_urls = [url] if url else self.load_start_urls()
-        self.client = MongoClient(Config.MONGO_URI)
+        # Items are persisted by spiders.pipelines.MongoPipeline; the spider only reads
+        self.client = get_client()
         self.db = self.client[Config.DATABASE_NAME]
         self.jobs_collection = self.db[Config.JOBS_COLLECTION]
         self.functions_collection = self.db[Config.functions_collection]
         self.sectors_collection = self.db[Config.sectors_collection]
-        self.new_jobs_count = 0
+        self.sector_encoder = get_encoder(self.db, Config.sectors_collection)
+        self.function_encoder = get_encoder(self.db, Config.functions_collection)
+        self.start_urls = [url] if url else self.load_start_urls()
 
     def load_start_urls(self):
         collection = self.db[Config.URLS_COLLECTION]
         urls = list(collection.find({}, {'_id': 0, 'url': 1}))
         return [url['url'] for url in urls]
 
-    def get_numeric_value(self, collection, value):
-        doc = collection.find_one({'name': value})
-        if doc:
-            return doc['numeric_value']
-        else:
-            numeric_value = collection.count_documents({}) + 1
-            collection.insert_one({'name': value, 'numeric_value': numeric_value})
-            return numeric_value
-
     def parse(self, response):
-        for job in response.xpath('//ul[@id="post-data"]/li'):
-            job_detail_url = response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get())
-            if not self.jobs_collection.find_one({'job_detail_url': job_detail_url}):
-                item = self.extract_job_item(job, response, job_detail_url)
-                self.jobs_collection.insert_one(dict(item))
-                self.new_jobs_count += 1
-                yield item
-                non_employable_item = self.create_non_employable_version(item)
-                self.jobs_collection.insert_one(non_employable_item)
-                yield non_employable_item
+        jobs = response.xpath('//ul[@id="post-data"]/li')
+        urls = [response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get()) for job in jobs]
+
+        # One round trip to find which listings on this page are already stored
+        known = {doc['job_detail_url'] for doc in self.jobs_collection.find(
+            {'job_detail_url': {'$in': urls}}, {'_id': 0, 'job_detail_url': 1})}
+
+        items = []
+        for job, job_detail_url in zip(jobs, urls):
+            if job_detail_url in known:
+                continue
+            known.add(job_detail_url)
+            item = self.extract_job_item(job, response, job_detail_url)
+            items.append(item)
+            items.append(self.create_non_employable_version(item))
+
+        yield from items
 
     def extract_job_item(self, job, response, job_detail_url):
         item = JobItem()
@@ -58,38 +59,23 @@ class JobSpider(scrapy.Spider):
         item['post_offered'] = job.xpath('.//em[contains(text(), "Postes proposés:")]/span/text()').get()
         sector_activities = [s.strip() for s in job.xpath('.//li[contains(text(), "Secteur d\'activité")]/a/text()').getall()]
         functions = [s.strip() for s in job.xpath('.//li[contains(text(), "Fonction")]/a/text()').getall()]
-        item['sector_activity'] = [self.get_numeric_value(self.sectors_collection, sector) for sector in sector_activities]
-        item['function'] = [self.get_numeric_value(self.functions_collection, func) for func in functions]
-        item['experience_required'] = [self.extract_minimum_experience(s.strip()) for s in job.xpath('.//li[contains(text(), "Expérience requise")]/a/text()').getall()]
-        item['study_level_required'] = self.extract_education(job.xpath('.//li[contains(text(), "Niveau d\'étude demandé")]/a/text()').get().strip())
+        item['sector_activity'] = [self.sector_encoder.encode(sector) for sector in sector_activities]
+        item['function'] = [self.function_encoder.encode(func) for func in functions]
+        item['experience_required'] = self.extract_minimum_experience([s.strip() for s in job.xpath('.//li[contains(text(), "Expérience requise")]/a/text()').getall()])
+        item['study_level_required'] = education_flags(job.xpath('.//li[contains(text(), "Niveau d\'étude demandé")]/a/text()').get().strip())
         item['contract_type_offered'] = job.xpath('.//li[contains(text(), "Type de contrat proposé")]/a/text()').get().strip()
         item['Employable'] = 1
         return item
 
-    def extract_minimum_experience(self, exp_string):
-        # Extract the numeric value from the experience string
-        matches = re.findall(r'\d+', exp_string)
-        return [int(num) for num in matches] if matches else [0]
-
-    def extract_education(self, text):
-        """ Map educational levels to structured format. """
-        levels = ['Bac', 'Bac +2', 'Bac +3', 'Bac +4', 'Bac +5', 'Doctorate']
-        values = [0] * len(levels)
-        if 'Bac ' in text or 'Below Bac' in text:
-            values[0:3] = [1, 1, 1]  # Bac to Bac +3
-        if 'Bac +2' in text:
-            values[1:3] = [1, 1]
-        if 'Bac +3' in text:
-            values[2:5] = [1, 1, 1]
-        if 'Bac +4' in text:
-            values[3:6] = [1, 1, 1]
-        if 'Bac +5' in text or 'Bac +5 et plus' in text:
-            values[4:6] = [1, 1]
-        return dict(zip(levels, values))
+    def extract_minimum_experience(self, exp_strings):
+        # Numbers in each experience string ('De 3 à 5 ans' -> [3, 5]), [0] when there are none
+        return experience_lists(exp_strings)
 
     def create_non_employable_version(self, item):
         non_item = dict(item)
         non_item['Employable'] = 0
+        # Copy so downgrading below does not also change the employable item
+        non_item['study_level_required'] = dict(item['study_level_required'])
 
         # Handle experience being a list of integers
         if item['experience_required']:
@@ -108,7 +94,8 @@ class JobSpider(scrapy.Spider):
         return non_item
 
     def close(self, reason):
-        self.client.close()
+        # The shared client stays open for the other spiders in this process
+        self.new_jobs_count = self.crawler.stats.get_value('mongo/new_jobs', 0)
         if self.new_jobs_count == 0:
             self.logger.info("No new jobs were scraped.")
         else:
@@ -0,0 +1,116 @@
+import datetime
+import threading
+import time
+from pymongo import MongoClient, ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from config import Config
+from predictionCounters import Counters
+
+_client = None
+_client_lock = threading.Lock()
+_indexes_ready = False
+
+def get_client():
+    """ Process-wide MongoClient shared by every spider and pipeline (it pools connections itself). """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = MongoClient(Config.MONGO_URI)
+        return _client
+
+def ensure_job_indexes(jobs_collection, logger):
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    # Each listing is stored twice (employable and synthetic non-employable)
+    try:
+        jobs_collection.create_index([('job_detail_url', ASCENDING), ('Employable', ASCENDING)], unique=True)
+    except OperationFailure as e:
+        logger.warning(f"Could not create unique job index (existing duplicates?): {e}")
+    _indexes_ready = True
+
+
+class MongoPipeline:
+    """ Buffer scraped items and write them to the jobs collection in bulk.
+
+    Items are upserted on (job_detail_url, Employable) with $setOnInsert in
+    unordered bulk_write batches of MONGO_PIPELINE_BATCH_SIZE, stamped with
+    scraped_at, and the crawl_state watermark is advanced by the rows inserted. Flush latency,
+    items written and items/sec are recorded in the crawl stats under mongo/.
+    An incremental spider's crawl frontier is committed after the last flush,
+    and only if every flush succeeded.
+    """
+    def __init__(self, stats, batch_size):
+        self.stats = stats
+        self.batch_size = batch_size
+        self.buffer = []
+        self.items_written = 0
+        self.failed = False
+        self.started = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.stats, crawler.settings.getint('MONGO_PIPELINE_BATCH_SIZE', 100))
+
+    def open_spider(self, spider):
+        db = get_client()[Config.DATABASE_NAME]
+        self.jobs_collection = db[Config.JOBS_COLLECTION]
+        self.crawl_state = db[Config.CRAWL_STATE_COLLECTION]
+        self.counters = Counters(db[Config.COUNTERS_COLLECTION])
+        ensure_job_indexes(self.jobs_collection, spider.logger)
+        self.started = time.perf_counter()
+
+    def process_item(self, item, spider):
+        self.buffer.append(dict(item))
+        if len(self.buffer) >= self.batch_size:
+            self.flush(spider)
+        return item
+
+    def close_spider(self, spider):
+        self.flush(spider)
+        frontier = getattr(spider, 'frontier', None)
+        if frontier is not None:
+            if self.failed:
+                spider.logger.warning("Some items were not stored; crawl frontier left unchanged so those pages are fetched again")
+            else:
+                frontier.commit()
+        elapsed = time.perf_counter() - self.started
+        self.stats.set_value('mongo/items_per_sec', round(self.items_written / elapsed, 2) if elapsed else 0)
+
+    def flush(self, spider):
+        if not self.buffer:
+            return
+        items, self.buffer = self.buffer, []
+        scraped_at = datetime.datetime.now()
+        operations = [
+            UpdateOne({'job_detail_url': item['job_detail_url'], 'Employable': item['Employable']},
+                      {'$setOnInsert': {**item, 'scraped_at': scraped_at}}, upsert=True)
+            for item in items
+        ]
+        started = time.perf_counter()
+        try:
+            upserted = list(self.jobs_collection.bulk_write(operations, ordered=False).upserted_ids)
+        except BulkWriteError as e:
+            # Another spider inserted some of these concurrently; keep what we did insert
+            upserted = [entry['index'] for entry in e.details.get('upserted', [])]
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                self.failed = True
+        except Exception:
+            self.failed = True
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        self.items_written += len(upserted)
+        self.counters.record_jobs(len(upserted))
+        if upserted:
+            # Change watermark read by train.py to decide whether retraining is worth it
+            self.crawl_state.update_one({'_id': 'jobs'}, {
+                '$inc': {'new_rows': len(upserted)},
+                '$max': {'max_scraped_at': scraped_at},
+            }, upsert=True)
+        self.stats.inc_value('mongo/flushes')
+        self.stats.inc_value('mongo/items_written', len(upserted))
+        self.stats.inc_value('mongo/new_jobs', sum(1 for index in upserted if items[index]['Employable'] == 1))
+        self.stats.inc_value('mongo/flush_latency_ms_total', latency_ms)
+        self.stats.max_value('mongo/flush_latency_ms_max', latency_ms)
+        spider.logger.debug(f"Flushed {len(items)} items ({len(upserted)} new) in {latency_ms:.1f} ms")
@@ -1,4 +1,5 @@
 # settings.py
 ITEM_PIPELINES = {
-    'EmployabilityAPP.pipelines.MongoPipeline': 300,
+    'spiders.pipelines.MongoPipeline': 300,
 }
+MONGO_PIPELINE_BATCH_SIZE = 100
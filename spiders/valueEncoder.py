@@ -0,0 +1,78 @@
+import threading
+from pymongo import ReturnDocument, ASCENDING
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from config import Config
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+def get_encoder(db, collection_name):
+    """ Process-wide encoder for a name -> numeric_value collection (sectors, functions). """
+    with _encoders_lock:
+        if collection_name not in _encoders:
+            _encoders[collection_name] = ValueEncoder(db[collection_name], db[Config.COUNTERS_COLLECTION])
+        return _encoders[collection_name]
+
+
+class ValueEncoder:
+    """ In-memory dictionary of numeric encodings backed by a Mongo collection.
+
+    All known encodings are loaded with one query, so encoding a known value is
+    a dict lookup. IDs for unseen values come from a counter document that is
+    advanced with find_one_and_update in blocks of block_size, and the mapping
+    is claimed with an upsert on the unique name index, so parallel spiders
+    agree on a single ID per value and never hand out the same ID twice.
+    """
+    def __init__(self, collection, counters_collection, block_size=20):
+        self.collection = collection
+        self.counters = counters_collection
+        self.counter_id = f'encoding:{collection.name}'
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.block_end = 0
+
+        try:
+            self.collection.create_index('name', unique=True)
+        except OperationFailure as e:
+            # Left over from the old find_one / insert_one race; without the index a concurrent claim may duplicate a name again
+            print(f"Could not create unique name index on {collection.name} (existing duplicates?):", e)
+        # Lowest ID first, so a duplicated name keeps the encoding it was given first
+        self.values = {}
+        highest = 0
+        for doc in self.collection.find({}, {'_id': 0, 'name': 1, 'numeric_value': 1}).sort('numeric_value', ASCENDING):
+            self.values.setdefault(doc['name'], doc['numeric_value'])
+            highest = doc['numeric_value']
+        # Never allocate below IDs handed out by the old count_documents() + 1 scheme, duplicates included
+        self.counters.update_one({'_id': self.counter_id}, {'$max': {'seq': highest}}, upsert=True)
+
+    def encode(self, value):
+        numeric_value = self.values.get(value)
+        if numeric_value is not None:
+            return numeric_value
+        with self.lock:
+            if value not in self.values:
+                self.values[value] = self._claim(value)
+            return self.values[value]
+
+    def _claim(self, value):
+        candidate = self._allocate()
+        try:
+            doc = self.collection.find_one_and_update(
+                {'name': value}, {'$setOnInsert': {'numeric_value': candidate}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+        except DuplicateKeyError:
+            # Lost a concurrent upsert for the same name; use the winner's ID
+            doc = self.collection.find_one({'name': value})
+        return doc['numeric_value']
+
+    def _allocate(self):
+        if self.next_id > self.block_end:
+            doc = self.counters.find_one_and_update(
+                {'_id': self.counter_id}, {'$inc': {'seq': self.block_size}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+            self.block_end = doc['seq']
+            self.next_id = self.block_end - self.block_size + 1
+        numeric_value = self.next_id
+        self.next_id += 1
+        return numeric_value
@@ -0,0 +1,57 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from config import Config
+
+# Startup instrumentation. With PROFILE_STARTUP=1 the API records how long each
+# import / model-load step takes and prints a report once startup is complete.
+# Run this file directly to get a per-package breakdown of import cost.
+
+timings = []
+
+@contextmanager
+def timed(label):
+    if not Config.PROFILE_STARTUP:
+        yield
+        return
+    modules_before = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.append((label, time.perf_counter() - start, len(sys.modules) - modules_before))
+
+def report():
+    if not Config.PROFILE_STARTUP:
+        return
+    total = sum(seconds for _, seconds, _ in timings)
+    print("Startup profile:")
+    for label, seconds, new_modules in timings:
+        print(f"  {label:<40} {seconds * 1000:9.1f} ms  ({new_modules} modules)")
+    print(f"  {'total':<40} {total * 1000:9.1f} ms")
+
+def import_costs(module):
+    """ Import `module` in a fresh interpreter and sum -X importtime per top-level package. """
+    env = dict(os.environ, PROFILE_STARTUP='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, env=env)
+    costs = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match:
+            self_us, name = int(match.group(1)), match.group(4)
+            package = name.split('.')[0]
+            costs[package] = costs.get(package, 0) + self_us
+    return result.stdout, costs
+
+if __name__ == '__main__':
+    module = sys.argv[1] if len(sys.argv) > 1 else 'app'
+    stdout, costs = import_costs(module)
+    print(stdout, end='')
+    print(f"Import cost by package for '{module}':")
+    for package, micros in sorted(costs.items(), key=lambda kv: kv[1], reverse=True)[:25]:
+        print(f"  {package:<40} {micros / 1000:9.1f} ms")
+    print(f"  {'total':<40} {sum(costs.values()) / 1000:9.1f} ms")
@@ -0,0 +1,117 @@
+import queue
+import threading
+import time
+
+class StatsWriter:
+    """ Write-behind buffer for prediction stats documents.
+
+    write() only enqueues; a background thread flushes with insert_many once
+    flush_size documents are pending or flush_interval seconds have passed.
+    At most max_pending documents are held in memory. When the buffer is full
+    (Mongo slow or down) the 'drop' policy discards new documents, while the
+    'block' policy waits up to block_timeout seconds for room before dropping.
+    Each listener is called with the batch after it has been inserted.
+    Documents written after close() are counted as dropped.
+    """
+    def __init__(self, collection, flush_size=500, flush_interval=1.0, max_pending=10000,
+                 policy='drop', block_timeout=0.5, listeners=()):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.collection = collection
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.listeners = list(listeners)
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name='stats-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, document):
+        if self.closed:
+            with self.lock:
+                self.dropped += 1
+            return False
+        try:
+            if self.policy == 'block':
+                self.queue.put(document, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(document)
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+
+    def close(self):
+        """ Flush everything still buffered and stop the background thread. """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)  # blocks until there is room, so nothing queued is lost
+        self.thread.join()
+        # A write that raced with close() can land behind the sentinel; nothing will flush it
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                self.dropped += 1
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                document = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                document = False
+            if document is None:
+                self._flush(batch)
+                return
+            if document is not False:
+                batch.append(document)
+            if len(batch) >= self.flush_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            print("Failed to write prediction stats:", e)
+            with self.lock:
+                self.failed += len(batch)
+            return
+        with self.lock:
+            self.written += len(batch)
+            self.flushes += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+        for listener in self.listeners:
+            try:
+                listener(batch)
+            except Exception as e:
+                print("Stats flush listener failed:", e)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'pending': self.queue.qsize(),
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'flushes': self.flushes,
+                'last_flush_ms': self.last_flush_ms,
+            }
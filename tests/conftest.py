@@ -0,0 +1,24 @@
+import mongomock
+import mongomock.collection
+import pytest
+from config import Config
+from spiders import job_spider, pipelines
+
+# mongomock 4.3 predates the sort= argument that pymongo >= 4.11 passes to the
+# bulk write builders (UpdateOne / ReplaceOne in bulk_write); accept and ignore it.
+_builder = mongomock.collection.BulkOperationBuilder
+for _name in ('add_update', 'add_replace'):
+    def _drop_sort(method):
+        def wrapper(self, *args, sort=None, **kwargs):
+            return method(self, *args, **kwargs)
+        return wrapper
+    setattr(_builder, _name, _drop_sort(getattr(_builder, _name)))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """ mongomock database handed to the spiders and pipelines in place of the shared MongoClient. """
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(job_spider, 'get_client', lambda: client)
+    monkeypatch.setattr(pipelines, 'get_client', lambda: client)
+    return client[Config.DATABASE_NAME]
@@ -0,0 +1,39 @@
+import glob
+import json
+import os
+import pytest
+from scrapy.http import HtmlResponse
+from spiders.job_spider import JobSpider
+
+# Both listing extractors against the expected items of the hand-written fixture
+# pages (same corpus as benchmarkExtraction.py).
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'debugData', 'fixtures')
+BASE_URL = 'https://www.rekrute.com/offres.html?p='
+
+
+def listings():
+    for n, path in enumerate(sorted(glob.glob(os.path.join(FIXTURES, 'listings_*.html'))), 1):
+        with open(path, 'rb') as f:
+            response = HtmlResponse(url=f'{BASE_URL}{n}', body=f.read(), encoding='utf-8')
+        for job in response.xpath('//ul[@id="post-data"]/li'):
+            yield job, response, response.urljoin(job.xpath('.//h2/a[@class="titreJob"]/@href').get())
+
+
+@pytest.fixture
+def expected():
+    with open(os.path.join(FIXTURES, 'expected_items.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('extractor', ['extract_job_item', 'extract_job_item_single_pass'])
+def test_extractor_matches_expected_items(db, expected, extractor):
+    extract = getattr(JobSpider(url=BASE_URL + '1'), extractor)
+    items = {url: dict(extract(job, response, url)) for job, response, url in listings()}
+    assert items == expected
+
+
+def test_extractors_agree(db):
+    spider = JobSpider(url=BASE_URL + '1')
+    for job, response, url in listings():
+        assert dict(spider.extract_job_item_single_pass(job, response, url)) == dict(spider.extract_job_item(job, response, url))
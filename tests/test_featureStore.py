@@ -0,0 +1,72 @@
+import numpy as np
+from config import Config
+from ml_model.featureStore import FeatureStore
+from ml_model.features import FEATURE_COLUMNS
+
+# mongomock has no $convert, so the snapshot ID is checked with a plain
+# projection of the same fields instead of predictor.FEATURE_PIPELINE.
+PIPELINE = [{'$project': {
+    '_id': 0,
+    'experience_required': {'$arrayElemAt': [{'$arrayElemAt': ['$experience_required', 0]}, 0]},
+    **{level: f'$study_level_required.{level}' for level in FEATURE_COLUMNS[1:]},
+    'Employable': '$Employable',
+}}]
+
+
+def job(url, experience, employable, level='Bac +2'):
+    levels = {name: int(name in ('Bac', level)) for name in FEATURE_COLUMNS[1:]}
+    return {'job_detail_url': url, 'experience_required': [[experience, experience + 2]],
+            'study_level_required': levels, 'Employable': employable}
+
+
+def jobs(db):
+    collection = db[Config.JOBS_COLLECTION]
+    collection.insert_many([job('a', 1, 1), job('b', 3, 0), job('c', 5, 1, 'Bac +5')])
+    return collection
+
+
+def test_snapshot_id_is_stable(db, tmp_path):
+    collection = jobs(db)
+    store = FeatureStore(str(tmp_path))
+    assert store.snapshot_id(collection, PIPELINE) == store.snapshot_id(collection, PIPELINE)
+
+
+def test_snapshot_id_changes_when_a_document_is_edited(db, tmp_path):
+    collection = jobs(db)
+    store = FeatureStore(str(tmp_path))
+    before = store.snapshot_id(collection, PIPELINE)
+    collection.update_one({'job_detail_url': 'b'}, {'$set': {'experience_required': [[4, 6]]}})
+    assert store.snapshot_id(collection, PIPELINE) != before
+
+
+def test_snapshot_id_changes_when_labels_swap_between_rows(db, tmp_path):
+    collection = jobs(db)
+    store = FeatureStore(str(tmp_path))
+    before = store.snapshot_id(collection, PIPELINE)
+    collection.update_one({'job_detail_url': 'a'}, {'$set': {'Employable': 0}})
+    collection.update_one({'job_detail_url': 'b'}, {'$set': {'Employable': 1}})
+    assert store.snapshot_id(collection, PIPELINE) != before
+
+
+def test_snapshot_id_changes_on_delete_and_insert_keeping_the_newest_id(db, tmp_path):
+    collection = jobs(db)
+    store = FeatureStore(str(tmp_path))
+    before = store.snapshot_id(collection, PIPELINE)
+    # Same count and same newest _id; only an older row was replaced
+    oldest = collection.find_one({'job_detail_url': 'a'})
+    collection.delete_one({'_id': oldest['_id']})
+    collection.insert_one({**job('d', 2, 0), '_id': oldest['_id']})
+    assert store.snapshot_id(collection, PIPELINE) != before
+
+
+def test_write_and_read_round_trip(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    columns = {'experience_required': np.array([1.0, 3.0, 5.0]), 'Bac +2': np.array([1.0, 0.0, 1.0]),
+               'Employable': np.array([1, 0, 1])}
+    store.write('abc', columns)
+    assert store.exists('abc')
+    loaded = store.read('abc')
+    assert list(loaded) == list(columns)
+    for name in columns:
+        assert isinstance(loaded[name], np.memmap)
+        np.testing.assert_array_equal(loaded[name], columns[name])
@@ -0,0 +1,58 @@
+import re
+import numpy as np
+import pandas as pd
+from ml_model.features import MAX_DIGITS, experience_lists, experience_numbers, first_experience
+
+# The vectorized experience parser against the per-string regex it replaced.
+
+EDGE_CASES = [
+    '',
+    'De 3 à 5 ans',
+    'Plus de 10 ans',
+    'Sans expérience',
+    'Débutant < 1 an',
+    '007',
+    '1 2 3 4 5 6 7',
+    '12ans34',
+    '9' * MAX_DIGITS,
+    '1' * (MAX_DIGITS + 1) + ' puis 2',
+    '3 ans, réf. 123456789012345678901234567890',
+    '٣ à ٥ ans',
+    '١٢ ans et ۷',
+    '²',
+    'x' * 40 + '8',
+]
+
+
+def old_experience(text):
+    return [int(n) for n in re.findall(r'\d+', text)] or [0]
+
+
+def test_experience_lists_matches_regex_on_edge_cases():
+    assert experience_lists(EDGE_CASES) == [old_experience(text) for text in EDGE_CASES]
+
+
+def test_experience_lists_matches_regex_on_random_strings():
+    rng = np.random.default_rng(0)
+    alphabet = list('0123456789 abà-<+') + ['٣', '۵', '²']
+    texts = [''.join(rng.choice(alphabet, size=rng.integers(0, 30))) for _ in range(500)]
+    assert experience_lists(texts) == [old_experience(text) for text in texts]
+
+
+def test_experience_lists_empty_input():
+    assert experience_lists([]) == []
+
+
+def test_experience_numbers_flags_long_runs_only():
+    numbers, counts, overflow = experience_numbers(['9' * MAX_DIGITS, '9' * (MAX_DIGITS + 1), 'De 3 à 5 ans'])
+    assert overflow.tolist() == [False, True, False]
+    assert counts.tolist() == [1, 1, 2]
+    assert numbers[0, 0] == int('9' * MAX_DIGITS)
+    assert numbers[2].tolist() == [3, 5]
+
+
+def test_first_experience():
+    series = pd.Series([[[3, 5]], [2, 4], [], None, 'x', [[]], [True]], index=range(10, 17))
+    result = first_experience(series)
+    assert result.tolist() == [3.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    assert result.index.tolist() == list(range(10, 17))
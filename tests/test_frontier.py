@@ -0,0 +1,157 @@
+import hashlib
+import http.server
+import os
+import threading
+import urllib.error
+import urllib.request
+import pytest
+import scrapy
+from scrapy.http import HtmlResponse
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+from config import Config
+from spiders import pipelines
+from spiders.job_spider import JobSpider
+from spiders.pipelines import MongoPipeline
+
+# Incremental crawl (spiders/frontier.py) against debugData/fixtures served over HTTP.
+# The Scrapy engine is replaced by a small loop that downloads each request with
+# urllib, so the crawl runs synchronously and can be repeated within one test.
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'debugData', 'fixtures')
+PAGES = ['listings_p1.html', 'listings_p2.html']
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """ Serves the fixture pages with an ETag, answering If-None-Match with 304. """
+    def do_GET(self):
+        path = os.path.join(FIXTURES, self.path.lstrip('/'))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.server.etags and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.etags:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    httpd.etags = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def page_urls(server, pages=PAGES):
+    return [f'http://127.0.0.1:{server.server_port}/{page}' for page in pages]
+
+
+def fetch(request):
+    """ Download a scrapy.Request the way the downloader would, keeping 304 responses. """
+    headers = {name.decode(): values[0].decode() for name, values in request.headers.items()}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(request.url, headers=headers)) as response:
+            status, headers, body = response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        status, headers, body = e.code, dict(e.headers), b''
+    return HtmlResponse(request.url, status=status, headers=headers, body=body, encoding='utf-8', request=request)
+
+
+def crawl(urls, pipeline=None):
+    """ Run an incremental JobSpider over urls; returns the (url, status) of every page fetched. """
+    spider = JobSpider(urls=urls, incremental=True)
+    pipeline = pipeline or MongoPipeline(MemoryStatsCollector(get_crawler()), batch_size=100)
+    pipeline.open_spider(spider)
+    requests = list(spider.start_requests())
+    fetched = []
+    while requests:
+        request = requests.pop(0)
+        response = fetch(request)
+        fetched.append((request.url, response.status))
+        for output in request.callback(response, **request.cb_kwargs):
+            if isinstance(output, scrapy.Request):
+                requests.append(output)
+            else:
+                pipeline.process_item(output, spider)
+    pipeline.close_spider(spider)
+    return fetched
+
+
+def test_first_run_fetches_every_page_and_records_frontier(server, db):
+    urls = page_urls(server)
+    assert crawl(urls) == [(urls[0], 200), (urls[1], 200)]
+    assert db[Config.JOBS_COLLECTION].count_documents({}) == 20  # 10 listings, each also stored non-employable
+    entries = {doc['url']: doc for doc in db[Config.FRONTIER_COLLECTION].find()}
+    assert set(entries) == set(urls)
+    assert all(entry['etag'] and entry['content_hash'] and entry['last_new_jobs'] == 5 for entry in entries.values())
+
+
+def test_not_modified_page_stops_pagination(server, db):
+    urls = page_urls(server)
+    crawl(urls)
+    assert crawl(urls) == [(urls[0], 304)]
+    assert db[Config.JOBS_COLLECTION].count_documents({}) == 20
+
+
+def test_unchanged_listing_hash_stops_pagination(server, db):
+    server.etags = False
+    urls = page_urls(server)
+    crawl(urls)
+    assert db[Config.FRONTIER_COLLECTION].find_one({'url': urls[0]})['etag'] is None
+    assert crawl(urls) == [(urls[0], 200)]
+    assert db[Config.JOBS_COLLECTION].count_documents({}) == 20
+
+
+def test_page_without_new_jobs_stops_pagination(server, db):
+    server.etags = False
+    urls = page_urls(server)
+    crawl(urls[:1])
+    db[Config.FRONTIER_COLLECTION].delete_many({})  # page 1 changed, but only around jobs we already have
+    assert crawl(urls) == [(urls[0], 200)]
+    assert db[Config.FRONTIER_COLLECTION].find_one({'url': urls[0]})['last_new_jobs'] == 0
+    assert db[Config.JOBS_COLLECTION].count_documents({}) == 10
+
+
+def test_frontier_not_recorded_until_items_are_stored(server, db):
+    urls = page_urls(server)
+    pipeline = MongoPipeline(MemoryStatsCollector(get_crawler()), batch_size=100)
+    failing = db[Config.JOBS_COLLECTION]
+
+    def bulk_write(*args, **kwargs):
+        raise pipelines.OperationFailure("write failed")
+
+    class FailingJobs:
+        def __getattr__(self, name):
+            return bulk_write if name == 'bulk_write' else getattr(failing, name)
+
+    original_open = pipeline.open_spider
+
+    def open_spider(spider):
+        original_open(spider)
+        pipeline.jobs_collection = FailingJobs()
+    pipeline.open_spider = open_spider
+
+    with pytest.raises(pipelines.OperationFailure):
+        crawl(urls, pipeline)
+    assert db[Config.FRONTIER_COLLECTION].count_documents({}) == 0
+
+    # The next run fetches and stores the pages again instead of getting a 304
+    assert crawl(urls) == [(urls[0], 200), (urls[1], 200)]
+    assert db[Config.JOBS_COLLECTION].count_documents({}) == 20
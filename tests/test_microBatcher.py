@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from ml_model.microBatcher import MicroBatcher
+
+
+class Model:
+    """ predict_fn that records each batch and can hold the batcher inside a call until released. """
+    def __init__(self, hold=False):
+        self.batches = []
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, records):
+        self.batches.append(list(records))
+        self.entered.set()
+        self.release.wait(5)
+        if 'bad' in records:
+            raise ValueError("malformed record")
+        return [f'p({record})' for record in records]
+
+
+def queue_depth(batcher, depth, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while batcher.queue.qsize() < depth:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_lone_request_is_dispatched_without_waiting():
+    model = Model()
+    batcher = MicroBatcher(model, max_batch_size=32, max_wait_ms=2000)
+    started = time.perf_counter()
+    assert batcher.predict('a', timeout=5) == 'p(a)'
+    assert time.perf_counter() - started < 0.5
+    assert model.batches == [['a']]
+    batcher.close()
+
+
+def test_concurrent_requests_share_one_batch():
+    model = Model(hold=True)
+    batcher = MicroBatcher(model, max_batch_size=32, max_wait_ms=50)
+    first = batcher.submit('a')
+    assert model.entered.wait(2)
+    # These arrive while the model is busy with 'a', so the next pass takes them together
+    futures = [batcher.submit(record) for record in 'bcd']
+    model.release.set()
+    assert first.result(5) == 'p(a)'
+    assert [future.result(5) for future in futures] == ['p(b)', 'p(c)', 'p(d)']
+    assert model.batches == [['a'], ['b', 'c', 'd']]
+    assert batcher.stats()['batch_size_histogram'] == {1: 1, 3: 1}
+    batcher.close()
+
+
+def test_failing_batch_is_retried_record_by_record():
+    model = Model(hold=True)
+    batcher = MicroBatcher(model, max_batch_size=32, max_wait_ms=50)
+    batcher.submit('a')
+    assert model.entered.wait(2)
+    futures = [batcher.submit(record) for record in ['b', 'bad', 'c']]
+    model.release.set()
+    assert futures[0].result(5) == 'p(b)'
+    with pytest.raises(ValueError):
+        futures[1].result(5)
+    assert futures[2].result(5) == 'p(c)'
+    assert model.batches[1:] == [['b', 'bad', 'c'], ['b'], ['bad'], ['c']]
+    batcher.close()
+
+
+def test_close_drains_pending_requests():
+    model = Model(hold=True)
+    batcher = MicroBatcher(model, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit('a')]
+    assert model.entered.wait(2)
+    futures += [batcher.submit(record) for record in 'bcde']
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    queue_depth(batcher, 5)  # the four requests plus the stop marker behind them
+    model.release.set()
+    closer.join(5)
+    assert not closer.is_alive()
+    assert [future.result(0) for future in futures] == ['p(a)', 'p(b)', 'p(c)', 'p(d)', 'p(e)']
+    assert model.batches == [['a'], ['b', 'c'], ['d', 'e']]
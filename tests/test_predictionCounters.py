@@ -0,0 +1,67 @@
+import time
+from predictionCounters import Counters, COUNTERS_ID
+
+
+class CountingCollection:
+    """ Stats collection of one API process; counts the reconcile queries it serves. """
+    def __init__(self, collection):
+        self.collection = collection
+        self.counted = 0
+
+    def count_documents(self, query, **kwargs):
+        self.counted += 1
+        return self.collection.count_documents(query, **kwargs)
+
+
+class RacingCollection:
+    """ Counters collection where a prediction lands right after reconcile reads the stored stats_count. """
+    def __init__(self, collection, stats):
+        self.collection = collection
+        self.stats = stats
+        self.fired = False
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def find_one(self, query, projection=None):
+        doc = self.collection.find_one(query, projection)
+        if projection and 'stats_count' in projection and not self.fired:
+            self.fired = True
+            prediction = {'prediction': 1}
+            self.stats.insert_one(dict(prediction))
+            Counters(self.collection).record_predictions([prediction])
+        return doc
+
+
+def test_lease_has_one_holder_until_it_expires(db):
+    counters = Counters(db.counters)
+    assert counters.acquire_lease('api-1', 60)
+    assert not counters.acquire_lease('api-2', 60)
+    assert counters.acquire_lease('api-1', 60)  # renewal
+    assert counters.acquire_lease('api-1', -1)  # let it lapse
+    assert counters.acquire_lease('api-2', 60)
+    assert not counters.acquire_lease('api-1', 60)
+
+
+def test_only_the_lease_holder_reconciles(db):
+    db.stats.insert_many([{'prediction': 1}, {'prediction': 0}])
+    processes = [CountingCollection(db.stats) for _ in range(3)]
+    stops = [Counters(db.counters).start_reconciler(stats, db.jobs, interval=0.2) for stats in processes]
+    time.sleep(0.9)
+    for stop in stops:
+        stop.set()
+    counted = sorted(stats.counted for stats in processes)
+    assert counted[:2] == [0, 0]
+    assert counted[2] >= 3 * 4  # the initial pass plus a few intervals, four counts each
+    assert Counters(db.counters).get()['stats_count'] == 2
+
+
+def test_reconcile_keeps_increments_made_while_it_runs(db):
+    db.jobs.insert_many([{'n': n} for n in range(5)])
+    db.stats.insert_many([{'prediction': 1}, {'prediction': 1}, {'prediction': 0}])
+    db.counters.insert_one({'_id': COUNTERS_ID, 'jobs_count': 2, 'stats_count': 1, 'employable_count': 1, 'non_employable_count': 1})
+    counters = Counters(RacingCollection(db.counters, db.stats))
+    counters.reconcile(db.stats, db.jobs)
+    # A $set of the counted 3 would have dropped the prediction recorded mid-reconcile
+    assert counters.get() == {'jobs_count': 5, 'stats_count': 4, 'employable_count': 3, 'non_employable_count': 1}
+    assert db.stats.count_documents({}) == 4
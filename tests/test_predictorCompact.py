@@ -0,0 +1,38 @@
+import numpy as np
+from ml_model.features import FEATURE_COLUMNS
+from ml_model.predictorCompact import EmploymentPredictor, quantize
+
+# The memory-mapped directory replicas load must predict exactly like the .npz.
+
+RNG = np.random.default_rng(0)
+
+
+def compact_model(width=5):
+    model = EmploymentPredictor()
+    model.scale = RNG.uniform(0.05, 1.0, len(FEATURE_COLUMNS))
+    model.min_ = RNG.uniform(-0.5, 0.5, len(FEATURE_COLUMNS))
+    model.layers = [
+        quantize(RNG.normal(size=(len(FEATURE_COLUMNS), width)).astype(np.float32)) + (RNG.normal(size=width).astype(np.float32), 'relu'),
+        quantize(RNG.normal(size=(width, 1)).astype(np.float32)) + (RNG.normal(size=1).astype(np.float32), 'sigmoid'),
+    ]
+    return model
+
+
+def test_save_folded_loads_memory_mapped_and_matches_npz(tmp_path):
+    model = compact_model()
+    model.save_model(str(tmp_path / 'model_compact.npz'))
+    model.save_folded(str(tmp_path / 'model_compact_mmap'))
+
+    from_npz = EmploymentPredictor()
+    from_npz.load_model(str(tmp_path / 'model_compact.npz'))
+    mapped = EmploymentPredictor()
+    mapped.load_model(str(tmp_path / 'model_compact_mmap'), mmap_mode='r')
+
+    for (q, qscale, bias, activation), (mq, mqscale, mbias, mactivation) in zip(from_npz.layers, mapped.layers):
+        assert isinstance(mq, np.memmap) and mq.dtype == np.int8
+        np.testing.assert_array_equal(mq, q)
+        np.testing.assert_array_equal(mqscale, qscale)
+        np.testing.assert_array_equal(mbias, bias)
+        assert mactivation == activation
+    X = RNG.uniform(0, 1, (20, len(FEATURE_COLUMNS))).astype(np.float32)
+    np.testing.assert_array_equal(mapped.forward(X), from_npz.forward(X))
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from ml_model.features import FEATURE_COLUMNS
+from ml_model.predictorNumpy import EmploymentPredictor, fold_layers
+
+# Parity of the TensorFlow-free engine with the network it was exported from.
+
+RNG = np.random.default_rng(0)
+RECORD = {"experience_required": 3, "Bac": 1, "Bac +2": 1, "Bac +3": 1, "Bac +4": 0, "Bac +5": 0, "Doctorate": 0}
+
+
+def exported_state(width=5, epsilon=0.5):
+    """ The arrays export_numpy_model writes for Dense(relu) -> BatchNormalization -> Dense(sigmoid). """
+    n_features = len(FEATURE_COLUMNS)
+    return {
+        'scale': RNG.uniform(0.05, 1.0, n_features),
+        'min_': RNG.uniform(-0.5, 0.5, n_features),
+        'layers': np.array(['dense:relu', 'batchnorm', 'dense:sigmoid']),
+        'layer_0_kernel': RNG.normal(size=(n_features, width)).astype(np.float32),
+        'layer_0_bias': RNG.normal(size=width).astype(np.float32),
+        'layer_1_gamma': RNG.uniform(0.5, 2.0, width).astype(np.float32),
+        'layer_1_beta': RNG.normal(size=width).astype(np.float32),
+        'layer_1_moving_mean': RNG.normal(size=width).astype(np.float32),
+        'layer_1_moving_variance': RNG.uniform(0.1, 2.0, width).astype(np.float32),
+        # Large on purpose, so dropping or misplacing it changes the output
+        'layer_1_epsilon': np.array(epsilon),
+        'layer_2_kernel': RNG.normal(size=(width, 1)).astype(np.float32),
+        'layer_2_bias': RNG.normal(size=1).astype(np.float32),
+    }
+
+
+def reference_proba(state, record):
+    """ The unfolded network, written out step by step in float64. """
+    x = np.array([float(record[col]) for col in FEATURE_COLUMNS]) * state['scale'] + state['min_']
+    x = np.maximum(x @ state['layer_0_kernel'] + state['layer_0_bias'], 0)
+    x = (x - state['layer_1_moving_mean']) / np.sqrt(state['layer_1_moving_variance'] + state['layer_1_epsilon'])
+    x = x * state['layer_1_gamma'] + state['layer_1_beta']
+    x = x @ state['layer_2_kernel'] + state['layer_2_bias']
+    return float(1 / (1 + np.exp(-x[0])))
+
+
+@pytest.fixture
+def exported(tmp_path):
+    state = exported_state()
+    path = tmp_path / 'model_numpy.npz'
+    np.savez(path, **state)
+    return state, str(path)
+
+
+def test_fold_layers_absorbs_batchnorm_into_next_dense():
+    layers = fold_layers(exported_state())
+    assert [activation for *_, activation in layers] == ['relu', 'sigmoid']
+    assert [kernel.shape for kernel, *_ in layers] == [(len(FEATURE_COLUMNS), 5), (5, 1)]
+
+
+def test_trailing_batchnorm_is_kept_as_diagonal_layer():
+    state = exported_state()
+    state['layers'] = np.array(['dense:relu', 'batchnorm'])
+    kernel, bias, activation = fold_layers(state)[-1]
+    s = state['layer_1_gamma'] / np.sqrt(state['layer_1_moving_variance'] + state['layer_1_epsilon'])
+    np.testing.assert_allclose(np.diag(kernel), s, rtol=1e-6)
+    np.testing.assert_allclose(bias, state['layer_1_beta'] - state['layer_1_moving_mean'] * s, rtol=1e-5, atol=1e-6)
+    assert activation == 'linear'
+
+
+def test_forward_matches_hand_computed_network(exported):
+    state, path = exported
+    engine = EmploymentPredictor()
+    engine.load_model(path)
+    records = [RECORD, {**RECORD, 'experience_required': 0, 'Bac +3': 0}, {col: 1 for col in FEATURE_COLUMNS}]
+    for record in records:
+        assert engine.predict_proba(record) == pytest.approx(reference_proba(state, record), abs=1e-6)
+    assert list(engine.predict_proba_batch(records)) == pytest.approx([reference_proba(state, r) for r in records], abs=1e-6)
+
+
+def test_folded_directory_round_trip_is_memory_mapped(exported, tmp_path):
+    _, path = exported
+    engine = EmploymentPredictor()
+    engine.load_model(path)
+    engine.save_folded(str(tmp_path / 'model_mmap'))
+
+    mapped = EmploymentPredictor()
+    mapped.load_model(str(tmp_path / 'model_mmap'), mmap_mode='r')
+    assert all(isinstance(kernel, np.memmap) for kernel, *_ in mapped.layers)
+    X = RNG.random((32, len(FEATURE_COLUMNS))).astype(np.float32)
+    np.testing.assert_array_equal(mapped.forward(X), engine.forward(X))
+    assert mapped.predict_proba(RECORD) == engine.predict_proba(RECORD)
+
+
+def test_export_matches_keras(tmp_path):
+    pytest.importorskip("tensorflow")
+    from sklearn.preprocessing import MinMaxScaler
+    from ml_model.predictor import EmploymentPredictor as KerasPredictor
+
+    X = RNG.random((256, len(FEATURE_COLUMNS))) * [20, 1, 1, 1, 1, 1, 1]
+    y = (X[:, 0] > 5).astype(np.float32)
+    predictor = KerasPredictor()
+    predictor.scaler = MinMaxScaler().fit(X)
+    X_scaled = predictor.scaler.transform(X).astype(np.float32)
+    predictor.build_model(units=(16, 8), input_shape=X.shape[1])
+    # A few epochs so the BatchNormalization statistics move away from their initial values
+    predictor.model.fit(X_scaled, y, epochs=3, batch_size=32, verbose=0)
+
+    path = str(tmp_path / 'model_numpy.npz')
+    predictor.export_numpy_model(path)
+    engine = EmploymentPredictor()
+    engine.load_model(path)
+    expected = predictor.model.predict(X_scaled, verbose=0)
+    np.testing.assert_allclose(engine.forward(X_scaled), expected, atol=1e-5)
+    records = [dict(zip(FEATURE_COLUMNS, row)) for row in X[:8].tolist()]
+    assert list(engine.predict_proba_batch(records)) == pytest.approx(expected[:8, 0].tolist(), abs=1e-5)
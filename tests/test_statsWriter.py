@@ -0,0 +1,129 @@
+import threading
+import time
+import mongomock
+import pytest
+from statsWriter import StatsWriter
+
+
+class SlowCollection:
+    """ insert_many waits for release, so the writer's buffer can be filled up. """
+    def __init__(self, collection):
+        self.collection = collection
+        self.release = threading.Event()
+
+    def insert_many(self, documents, ordered=True):
+        self.release.wait(5)
+        return self.collection.insert_many(documents, ordered=ordered)
+
+
+class FailingCollection:
+    def insert_many(self, documents, ordered=True):
+        raise mongomock.OperationFailure("not primary")
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.stats
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_flushes_when_batch_is_full(collection):
+    batches = []
+    writer = StatsWriter(collection, flush_size=3, flush_interval=60, listeners=[batches.append])
+    for n in range(3):
+        writer.write({'n': n})
+    wait_for(lambda: writer.stats()['written'] == 3)
+    assert collection.count_documents({}) == 3
+    assert writer.stats()['flushes'] == 1
+    assert [[doc['n'] for doc in batch] for batch in batches] == [[0, 1, 2]]
+    writer.close()
+
+
+def test_flushes_after_interval(collection):
+    writer = StatsWriter(collection, flush_size=100, flush_interval=0.05)
+    writer.write({'n': 0})
+    wait_for(lambda: writer.stats()['written'] == 1)
+    assert collection.count_documents({}) == 1
+    writer.close()
+
+
+def test_drop_policy_discards_when_full(collection):
+    slow = SlowCollection(collection)
+    writer = StatsWriter(slow, flush_size=1, flush_interval=60, max_pending=2, policy='drop')
+    writer.write({'n': 0})
+    wait_for(lambda: writer.stats()['pending'] == 0)  # taken by the flush that is now waiting
+    assert writer.write({'n': 1}) and writer.write({'n': 2})
+    assert writer.write({'n': 3}) is False
+    assert writer.stats()['dropped'] == 1
+    slow.release.set()
+    writer.close()
+    assert sorted(doc['n'] for doc in collection.find()) == [0, 1, 2]
+    assert writer.stats()['written'] == 3
+
+
+def test_block_policy_waits_for_room_then_drops(collection):
+    slow = SlowCollection(collection)
+    writer = StatsWriter(slow, flush_size=1, flush_interval=60, max_pending=1, policy='block', block_timeout=0.05)
+    writer.write({'n': 0})
+    wait_for(lambda: writer.stats()['pending'] == 0)
+    assert writer.write({'n': 1})
+
+    started = time.monotonic()
+    assert writer.write({'n': 2}) is False
+    assert time.monotonic() - started >= 0.05
+    assert writer.stats()['dropped'] == 1
+
+    # A writer blocked on a full buffer goes through once the flush frees room
+    writer.block_timeout = 2
+    result = []
+    blocked = threading.Thread(target=lambda: result.append(writer.write({'n': 3})))
+    blocked.start()
+    time.sleep(0.05)
+    assert not result
+    slow.release.set()
+    blocked.join()
+    assert result == [True]
+    writer.close()
+    assert sorted(doc['n'] for doc in collection.find()) == [0, 1, 3]
+
+
+def test_close_drains_pending_documents(collection):
+    writer = StatsWriter(collection, flush_size=1000, flush_interval=60)
+    for n in range(5):
+        writer.write({'n': n})
+    writer.close()
+    assert collection.count_documents({}) == 5
+    stats = writer.stats()
+    assert (stats['pending'], stats['written'], stats['dropped']) == (0, 5, 0)
+
+
+def test_write_after_close_is_dropped(collection):
+    writer = StatsWriter(collection, flush_size=1000, flush_interval=60)
+    writer.close()
+    assert writer.write({'n': 0}) is False
+    assert writer.stats()['dropped'] == 1
+    assert collection.count_documents({}) == 0
+
+
+def test_insert_failure_is_counted_and_not_reported_to_listeners():
+    batches = []
+    writer = StatsWriter(FailingCollection(), flush_size=2, flush_interval=60, listeners=[batches.append])
+    writer.write({'n': 0})
+    writer.write({'n': 1})
+    wait_for(lambda: writer.stats()['failed'] == 2)
+    writer.write({'n': 2})
+    writer.close()
+    stats = writer.stats()
+    assert (stats['failed'], stats['written'], stats['flushes']) == (3, 0, 0)
+    assert batches == []
+
+
+def test_unknown_policy_is_rejected(collection):
+    with pytest.raises(ValueError):
+        StatsWriter(collection, policy='spill')
@@ -0,0 +1,45 @@
+from spiders.valueEncoder import ValueEncoder
+
+
+def encoder(db, block_size=20):
+    return ValueEncoder(db.sectors, db.counters, block_size=block_size)
+
+
+def test_encoders_sharing_a_collection_never_reuse_an_id(db):
+    first, second = encoder(db, block_size=3), encoder(db, block_size=3)
+    ids = {}
+    for n in range(10):
+        for name, enc in [(f'first {n}', first), (f'second {n}', second)]:
+            ids[name] = enc.encode(name)
+    assert len(set(ids.values())) == len(ids)
+    # A name the other encoder claimed first resolves to the same ID
+    assert second.encode('first 0') == ids['first 0']
+    assert first.encode('second 9') == ids['second 9']
+    assert db.sectors.count_documents({}) == len(ids)
+
+
+def test_stored_name_keeps_its_id(db):
+    db.sectors.insert_many([{'name': 'IT', 'numeric_value': 7}, {'name': 'Banque', 'numeric_value': 2}])
+    enc = encoder(db)
+    assert enc.encode('IT') == 7
+    assert enc.encode('Banque') == 2
+    # New names are allocated above everything already stored
+    assert enc.encode('Santé') == 8
+    assert encoder(db).encode('Santé') == 8
+
+
+def test_new_block_when_current_one_runs_out(db):
+    first, second = encoder(db, block_size=3), encoder(db, block_size=3)
+    assert first.encode('a') == 1   # first takes 1-3
+    assert second.encode('b') == 4  # second takes 4-6
+    assert [first.encode(name) for name in 'cde'] == [2, 3, 7]  # 'e' needs first's next block, 7-9
+    assert db.counters.find_one({'_id': 'encoding:sectors'})['seq'] == 9
+
+
+def test_index_build_over_duplicate_names_does_not_raise(db, capsys):
+    # Left by the old find_one / insert_one race
+    db.sectors.insert_many([{'name': 'IT', 'numeric_value': 3}, {'name': 'IT', 'numeric_value': 1}])
+    enc = encoder(db)
+    assert 'Could not create unique name index' in capsys.readouterr().out
+    assert enc.encode('IT') == 1  # the first encoding handed out wins
+    assert enc.encode('Banque') == 4
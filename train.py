@@ -1,22 +1,41 @@
 from ml_model.predictor import EmploymentPredictor
-import os
+from ml_model.modelRegistry import get_registry
+from pymongo import MongoClient
+from config import Config
+import datetime
+import sys
 
-def train_model():
+def train_model(warm_start=False):
     predictor = EmploymentPredictor()
 
-    model_path = 'ml_model/trained/model.h5'
-    #if os.path.exists(model_path):
-    #    predictor.load_model(model_path)
-    #    print("Existing model loaded.")
-    #else:
-    #    print("No existing model found. Training a new model.")
-
-    predictor.full_pipeline()
+    predictor.full_pipeline(warm_start=warm_start)
 
     if predictor.model:
         predictor.evaluate_model()
     else:
         print("Model not trained or loaded.")
 
+def train_if_needed(force=False):
+    """ Retrain only when the crawler has inserted at least RETRAIN_MIN_NEW_ROWS rows since the last training. """
+    client = MongoClient(Config.MONGO_URI)
+    state = client[Config.DATABASE_NAME][Config.CRAWL_STATE_COLLECTION]
+    crawl = state.find_one({'_id': 'jobs'}) or {}
+    trained = state.find_one({'_id': 'training'}) or {}
+
+    new_rows = crawl.get('new_rows', 0) - trained.get('new_rows', 0)
+    if not force and new_rows < Config.RETRAIN_MIN_NEW_ROWS:
+        print(f"{new_rows} new rows since last training (threshold {Config.RETRAIN_MIN_NEW_ROWS}), skipping.")
+        return False
+
+    print(f"{new_rows} new rows since last training, retraining.")
+    train_model(warm_start=get_registry().resolve()[1] is not None)
+    # Record the watermark read before training; rows crawled meanwhile count towards the next run
+    state.update_one({'_id': 'training'}, {'$set': {
+        'new_rows': crawl.get('new_rows', 0),
+        'max_scraped_at': crawl.get('max_scraped_at'),
+        'trained_at': datetime.datetime.now(),
+    }}, upsert=True)
+    return True
+
 if __name__ == '__main__':
-    train_model()
+    train_if_needed(force='--force' in sys.argv)